@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -14,7 +15,7 @@ from homeassistant.const import (
     EVENT_HOMEASSISTANT_STOP,
     Platform,
 )
-from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant, callback
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
@@ -23,13 +24,36 @@ from homeassistant.exceptions import (
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
 
 from .api.apartment import DigitalstromApartment
 from .api.client import DigitalstromClient
 from .api.exceptions import CannotConnect, InvalidAuth, InvalidCertificate, ServerError
-from .const import CONF_DSUID, CONF_SSL, DOMAIN, WEBSOCKET_WATCHDOG_INTERVAL
+from .const import (
+    CONF_DSUID,
+    CONF_EVENT_OVERFLOW_POLICY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_REQUEST_BURST,
+    CONF_SSL,
+    CONF_STRUCTURE_LOAD_CONCURRENCY,
+    DEFAULT_EVENT_OVERFLOW_POLICY,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_STRUCTURE_LOAD_CONCURRENCY,
+    DOMAIN,
+    SIGNAL_STRUCTURE_UPDATED,
+    STRUCTURE_LOAD_RETRY_MAX_DELAY,
+    STRUCTURE_LOAD_RETRY_MIN_DELAY,
+    STRUCTURE_SAVE_DELAY,
+    STRUCTURE_STORAGE_VERSION,
+    WEBSOCKET_WATCHDOG_INTERVAL,
+)
+from .coordinator import DigitalstromPollCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -73,6 +97,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         port=entry.data[CONF_PORT],
         ssl=entry.data[CONF_SSL],
         loop=hass.loop,
+        max_concurrent_requests=entry.options.get(
+            CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+        ),
+        max_requests_per_second=entry.options.get(
+            CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND
+        ),
+        request_burst=entry.options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+        event_overflow_policy=entry.options.get(
+            CONF_EVENT_OVERFLOW_POLICY, DEFAULT_EVENT_OVERFLOW_POLICY
+        ),
     )
     client.set_app_token(entry.data[CONF_TOKEN])
 
@@ -102,18 +136,54 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN].setdefault(entry.unique_id, dict())
         hass.data[DOMAIN][entry.unique_id]["client"] = client
         hass.data[DOMAIN][entry.unique_id]["apartment"] = apartment
-        await apartment.get_zones()
-        await apartment.get_circuits()
-        await apartment.get_devices()
+        store = structure_store(hass, entry)
+        hass.data[DOMAIN][entry.unique_id]["structure_store"] = store
     except (InvalidAuth, InvalidCertificate) as ex:
+        await client.close()
         raise ConfigEntryAuthFailed(ex) from ex
     except (CannotConnect, ServerError) as ex:
+        await client.close()
         raise ConfigEntryNotReady(ex) from ex
 
+    # Entities are created from the structure saved by the last run right
+    # away, the live structure is loaded in the background and only the
+    # differences are added or removed afterwards
+    await restore_structure(store, apartment)
+    hass.data[DOMAIN][entry.unique_id]["poll_coordinator"] = (
+        DigitalstromPollCoordinator(hass, entry, apartment)
+    )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(update_options))
+
+    @callback
+    def save_structure() -> None:
+        """Save the structure and the learned scene values after a delay."""
+        store.async_delay_save(
+            lambda: {
+                "dsuid": apartment.dsuid,
+                "structure": apartment.get_structure_snapshot(),
+            },
+            STRUCTURE_SAVE_DELAY,
+        )
+
+    @callback
+    def structure_changed(changes: dict[str, list[str]]) -> None:
+        """Apply structure changes reported by dSS model events."""
+        async_dispatcher_send(hass, SIGNAL_STRUCTURE_UPDATED.format(entry.entry_id))
+        update_device_names(hass, apartment, changes["changed"])
+        save_structure()
+
+    entry.async_on_unload(apartment.register_structure_callback(structure_changed))
+    entry.async_on_unload(apartment.register_scene_values_callback(save_structure))
+    entry.async_create_background_task(
+        hass,
+        load_structure(hass, entry, apartment, store),
+        f"{DOMAIN}_load_structure_{entry.unique_id}",
+    )
 
     async def start_watchdog(event: Any = None) -> None:
-        """Start websocket watchdog."""
+        """Start the websocket supervisor and its watchdog."""
+        client.start_event_supervisor()
         if "watchdog" not in hass.data[DOMAIN][entry.unique_id]:
             hass.data[DOMAIN][entry.unique_id]["watchdog"] = async_track_time_interval(
                 hass,
@@ -131,14 +201,92 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         await start_watchdog()
     else:
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, start_watchdog)
-        hass.bus.async_listen_once(
-            EVENT_HOMEASSISTANT_STARTED, client.event_listener_watchdog
-        )
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_watchdog)
 
     return True
 
 
+async def update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed poll intervals by reloading the config entry."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+def structure_store(hass: HomeAssistant, entry: ConfigEntry) -> Store:
+    return Store(hass, STRUCTURE_STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.structure")
+
+
+async def restore_structure(store: Store, apartment: DigitalstromApartment) -> None:
+    """Load the apartment structure saved by the last run."""
+    try:
+        snapshot = await store.async_load()
+        if snapshot is None or snapshot.get("dsuid") != apartment.dsuid:
+            return
+        apartment.load_structure_snapshot(snapshot["structure"])
+    except Exception as ex:
+        # The snapshot is only a cache, the live structure replaces it anyway
+        _LOGGER.warning(f"Ignoring the saved apartment structure: {ex}")
+        return
+    _LOGGER.debug(
+        f"Restored saved apartment structure with {len(apartment.zones)} zones, {len(apartment.circuits)} circuits and {len(apartment.devices)} devices"
+    )
+
+
+async def load_structure(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    apartment: DigitalstromApartment,
+    store: Store,
+) -> None:
+    """Load the apartment structure, save it and notify the platforms."""
+    delay = STRUCTURE_LOAD_RETRY_MIN_DELAY
+    while True:
+        try:
+            timings = await apartment.load_structure(
+                entry.options.get(
+                    CONF_STRUCTURE_LOAD_CONCURRENCY, DEFAULT_STRUCTURE_LOAD_CONCURRENCY
+                )
+            )
+            break
+        except (InvalidAuth, InvalidCertificate) as ex:
+            _LOGGER.error(f"Loading the apartment structure failed: {ex}")
+            entry.async_start_reauth(hass)
+            return
+        except (CannotConnect, ServerError) as ex:
+            _LOGGER.warning(
+                f"Loading the apartment structure failed, retrying in {delay} s: {ex}"
+            )
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, STRUCTURE_LOAD_RETRY_MAX_DELAY)
+    _LOGGER.debug(f"Apartment structure loaded: {timings}")
+    async_dispatcher_send(hass, SIGNAL_STRUCTURE_UPDATED.format(entry.entry_id))
+    await store.async_save(
+        {"dsuid": apartment.dsuid, "structure": apartment.get_structure_snapshot()}
+    )
+
+
+@callback
+def update_device_names(
+    hass: HomeAssistant, apartment: DigitalstromApartment, dsuids: list[str]
+) -> None:
+    """Apply renamed devices and circuits to the device registry."""
+    device_registry = dr.async_get(hass)
+    for dsuid in dsuids:
+        if (device := apartment.devices.get(dsuid)) is not None:
+            device = device.get_parent()
+            identifier, name = device.dsuid, device.name
+        elif (circuit := apartment.circuits.get(dsuid)) is not None:
+            identifier, name = circuit.dsuid, circuit.name
+        else:
+            continue
+        if (
+            len(name) > 0
+            and (dev := device_registry.async_get_device({(DOMAIN, identifier)}))
+            is not None
+            and dev.name != name
+        ):
+            device_registry.async_update_device(dev.id, name=name)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
@@ -147,11 +295,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             is not None
         ):
             remove_watchdog()
+        hass.data[DOMAIN][entry.unique_id]["apartment"].close()
         await hass.data[DOMAIN][entry.unique_id]["client"].stop_event_listener()
         hass.data[DOMAIN].pop(entry.unique_id)
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the saved apartment structure of a deleted config entry."""
+    await structure_store(hass, entry).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: dr.DeviceEntry
 ) -> bool:
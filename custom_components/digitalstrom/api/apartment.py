@@ -1,8 +1,20 @@
+import asyncio
+import bisect
 import logging
 import time
+from collections.abc import Awaitable, Callable
+from typing import Any
 
+from .breaker import DigitalstromQuerySupport
 from .client import DigitalstromClient
-from .const import BUTTON_BUS_EVENT_TIMEOUT
+from .const import (
+    BUTTON_BUS_EVENT_TIMEOUT,
+    REQUEST_PRIORITY_EVENT,
+    SPLIT_DETECTION_INCREMENTAL_LIMIT,
+    STRUCTURE_LOAD_CONCURRENCY,
+    STRUCTURE_REFRESH_DELAY,
+)
+from .exceptions import CannotConnect, InvalidAuth, ServerError
 
 APARTMENT_SCENES: list = [
     ("Auto Standby", 64, None, None, None),
@@ -35,11 +47,49 @@ class DigitalstromApartment:
         self.client = client
         self.dsuid = system_dsuid
         self.devices: dict[str, DigitalstromDevice] = {}
+        # Secondary indexes maintained by load_devices_from_list
+        self._device_index: dict[str, DigitalstromDevice] = {}
+        self._group_index: dict[tuple[int, int], dict[str, DigitalstromDevice]] = {}
+        self._meter_index: dict[str, dict[str, DigitalstromDevice]] = {}
+        self._indexed_keys: dict[str, tuple] = {}
+        self._sorted_devices: list[DigitalstromDevice] = []
+        self._split_dirty: set[int] = set()
         self.circuits: dict[str, DigitalstromCircuit] = {}
         self.zones: dict[int, DigitalstromZone] = {}
         self.scenes = []
+        self.output_query = DigitalstromQuerySupport()
+        self.power_state_query = DigitalstromQuerySupport()
+        self.state_query = DigitalstromQuerySupport()
+        self.metering_query = DigitalstromQuerySupport()
+        self.structure_load_timings: dict[str, float] = {}
+        self.structure_data: dict[str, list] = {}
+        self.structure_callbacks: list[Callable[[dict[str, list[str]]], None]] = []
+        self.scene_values_callbacks: list[Callable[[], None]] = []
+        self._structure_refresh_handle: asyncio.TimerHandle | None = None
+        self._structure_refresh_task: asyncio.Task | None = None
+        self._output_values_lock = asyncio.Lock()
         self.logger = logging.getLogger("digitalstrom_api")
+        self._event_handlers: dict[str, list[Callable[[dict], bool | None]]] = {}
+        for event_name, handler in [
+            ("deviceSensorValue", self._on_device_sensor_value),
+            ("deviceBinaryInputEvent", self._on_device_binary_input_event),
+            ("stateChange", self._on_apartment_state_change),
+            ("stateChange", self._on_state_change),
+            ("DeviceEvent", self._on_device_event),
+            ("callScene", self._on_button_scene),
+            ("callSceneBus", self._on_button_scene),
+            ("callScene", self._on_apartment_scene),
+            ("undoScene", self._on_apartment_scene),
+            ("callScene", self._on_output_scene),
+            ("callSceneBus", self._on_output_scene),
+            ("undoScene", self._on_output_scene),
+            ("buttonClick", self._on_button_click),
+            ("ModelReady", self._on_structure_changed),
+            ("apartmentStructureChanged", self._on_structure_changed),
+        ]:
+            self.register_event_handler(event_name, handler)
         client.register_event_callback(self.event_callback)
+        client.register_connection_callback(self.resync)
         from .scene import DigitalstromApartmentScene
 
         for scene in APARTMENT_SCENES:
@@ -58,196 +108,845 @@ class DigitalstromApartment:
         await self.client.request(f"apartment/undoScene?sceneNumber={scene}")
 
     def find_split_devices(self) -> None:
-        devices = sorted(self.devices.values(), key=lambda x: int(x.dsuid, 16))
-        for prev, curr in zip(devices, devices[1:]):
-            if (
-                int(curr.dsuid, 16) <= int(prev.dsuid, 16) + 0x100
-                and prev.meter_dsuid == curr.meter_dsuid
-                and (
-                    curr.dsuid_index != 0
-                    or (curr.oem_part_number not in [0, 1])
-                    or not (
-                        prev.dsuid_index == curr.dsuid_index
-                        and prev.oem_part_number == curr.oem_part_number
-                    )
-                )
+        # Devices are sorted by their numeric dSUID and split devices are
+        # always adjacent, so every group of merged devices is a contiguous
+        # run in that order. If only a few devices were added, removed or
+        # changed, only the runs around them are detected again.
+        dirty = self._split_dirty
+        self._split_dirty = set()
+        devices = self._sorted_devices
+        if len(dirty) == 0:
+            return
+        if len(dirty) > max(SPLIT_DETECTION_INCREMENTAL_LIMIT, len(devices) // 4):
+            self._merge_split_run(0, len(devices) - 1)
+            return
+        runs: list[tuple[int, int]] = []
+        for dsuid_int in dirty:
+            # Position of the device, or of its successor if it was removed
+            i = bisect.bisect_left(devices, dsuid_int, key=lambda d: d.dsuid_int)
+            first = max(0, i - 1)
+            while first > 0 and self._is_split_pair(devices[first - 1], devices[first]):
+                first -= 1
+            last = min(len(devices) - 1, i + 1)
+            while last < len(devices) - 1 and self._is_split_pair(
+                devices[last], devices[last + 1]
             ):
-                parent_device = (
-                    prev if prev.parent_device is None else prev.parent_device
+                last += 1
+            runs.append((first, last))
+        done = -1
+        for first, last in sorted(runs):
+            if last <= done:
+                continue
+            self._merge_split_run(max(first, done + 1), last)
+            done = last
+
+    def _is_split_pair(self, prev, curr) -> bool:
+        return (
+            curr.dsuid_int <= prev.dsuid_int + 0x100
+            and prev.meter_dsuid == curr.meter_dsuid
+            and (
+                curr.dsuid_index != 0
+                or (curr.oem_part_number not in [0, 1])
+                or not (
+                    prev.dsuid_index == curr.dsuid_index
+                    and prev.oem_part_number == curr.oem_part_number
                 )
-                curr.parent_device = parent_device
-                if curr.name not in parent_device.unique_device_names:
-                    parent_device.unique_device_names.append(curr.name)
-                self.logger.debug(f"Merging devices {parent_device.dsuid} {curr.dsuid}")
-                if parent_device.available != curr.available:
-                    self.logger.debug(
-                        f"Merged devices have different availability: {parent_device.available} {curr.available}"
-                    )
+            )
+        )
+
+    def _merge_split_run(self, first: int, last: int) -> None:
+        devices = self._sorted_devices[first : last + 1]
+        for device in devices:
+            device.parent_device = None
+        for prev, curr in zip(devices, devices[1:]):
+            if self._is_split_pair(prev, curr):
+                self.merge_devices(prev.get_parent(), curr)
+
+    def _split_key(self, device) -> tuple:
+        return (device.meter_dsuid, device.dsuid_index, device.oem_part_number)
+
+    def merge_devices(self, parent_device, device) -> None:
+        device.parent_device = parent_device
+        if device.name not in parent_device.unique_device_names:
+            parent_device.unique_device_names.append(device.name)
+        self.logger.debug(f"Merging devices {parent_device.dsuid} {device.dsuid}")
+        if parent_device.available != device.available:
+            self.logger.debug(
+                f"Merged devices have different availability: {parent_device.available} {device.available}"
+            )
 
     async def get_devices(self) -> dict:
         data = await self.client.request("apartment/getDevices")
         self.logger.debug(f"getDevices {data}")
+        self.load_devices_from_list(data)
+        self.find_split_devices()
+        return self.devices
+
+    def load_devices_from_list(self, data: list) -> None:
+        present = set()
         for d in data:
             if (dsuid := d.get("dSUID")) and (len(dsuid) > 0):
-                if dsuid not in self.devices.keys():
+                if (device := self.devices.get(dsuid)) is None:
                     from .device import DigitalstromDevice
 
                     device = DigitalstromDevice(self.client, self, dsuid)
                     self.devices[dsuid] = device
-                self.devices[dsuid].load_from_dict(d)
+                    bisect.insort(
+                        self._sorted_devices, device, key=lambda d: d.dsuid_int
+                    )
+                    self._split_dirty.add(device.dsuid_int)
+                self._load_device(device, d)
+                present.add(dsuid)
+        if len(present) > 0:
+            # Forget devices that were removed from the dSS
+            for dsuid in [k for k in self.devices.keys() if k not in present]:
+                device = self.devices.pop(dsuid)
+                self._unindex_device(dsuid)
+                i = bisect.bisect_left(
+                    self._sorted_devices, device.dsuid_int, key=lambda d: d.dsuid_int
+                )
+                del self._sorted_devices[i]
+                self._split_dirty.add(device.dsuid_int)
+            self.structure_data["devices"] = data
+
+    def _load_device(self, device, data: dict) -> None:
+        # Load a known device and keep the indexes and the split device
+        # detection up to date with it
+        split_key = self._split_key(device)
+        device.load_from_dict(data)
+        if self._split_key(device) != split_key:
+            self._split_dirty.add(device.dsuid_int)
+        self._index_device(device)
+
+    def _index_device(self, device) -> None:
+        keys = (
+            device.dsid,
+            tuple((device.zone_id, g) for g in device.group_ids),
+            device.meter_dsuid,
+        )
+        if self._indexed_keys.get(device.dsuid) == keys:
+            return
+        self._unindex_device(device.dsuid)
+        dsid, groups, meter_dsuid = keys
+        self._device_index[device.dsuid] = device
+        if len(dsid) > 0:
+            self._device_index[dsid] = device
+        for group in groups:
+            self._group_index.setdefault(group, {})[device.dsuid] = device
+        if meter_dsuid is not None:
+            self._meter_index.setdefault(meter_dsuid, {})[device.dsuid] = device
+        self._indexed_keys[device.dsuid] = keys
+
+    def _unindex_device(self, dsuid: str) -> None:
+        if (keys := self._indexed_keys.pop(dsuid, None)) is None:
+            return
+        dsid, groups, meter_dsuid = keys
+        device = self._device_index.pop(dsuid, None)
+        # Split devices share their dSID and dSIDs can be reassigned, keep the
+        # entry if it already points to another device
+        if len(dsid) > 0 and self._device_index.get(dsid) is device:
+            del self._device_index[dsid]
+        for group in groups:
+            if (devices := self._group_index.get(group)) is not None:
+                devices.pop(dsuid, None)
+                if len(devices) == 0:
+                    del self._group_index[group]
+        if (devices := self._meter_index.get(meter_dsuid)) is not None:
+            devices.pop(dsuid, None)
+            if len(devices) == 0:
+                del self._meter_index[meter_dsuid]
+
+    def get_device(self, identifier: str | None):
+        # Find a device by its dSUID or its dSID
+        return self._device_index.get(identifier)
+
+    def get_group_devices(self, zone_id: int, group_id: int) -> list:
+        return list(self._group_index.get((zone_id, group_id), {}).values())
+
+    def get_meter_devices(self, meter_dsuid: str) -> list:
+        return list(self._meter_index.get(meter_dsuid, {}).values())
+
+    def get_scene_devices(self, zone_id: int, group_id: int) -> list:
+        # Devices reached by a scene call, zone 0 is the whole apartment and
+        # group 0 all groups of the zone
+        if zone_id != 0 and group_id != 0:
+            return self.get_group_devices(zone_id, group_id)
+        return [
+            device
+            for device in self.devices.values()
+            if (zone_id == 0 or device.zone_id == zone_id)
+            and (group_id == 0 or group_id in device.group_ids)
+        ]
+
+    def get_scene_event_devices(self, data: dict) -> list:
+        source = data.get("source", {})
+        if source.get("isDevice"):
+            device = self.get_device(source.get("dsid"))
+            return [] if device is None else [device]
+        if source.get("isGroup") or source.get("isApartment"):
+            return self.get_scene_devices(
+                int(source.get("zoneID", 0)), int(source.get("groupID", 0))
+            )
+        return []
+
+    def apply_scene(
+        self, zone_id: int, group_id: int, scene: int, undo: bool = False
+    ) -> None:
+        # Set the predicted outputs of a scene call without reading them
+        for device in self.get_scene_devices(zone_id, group_id):
+            if undo:
+                device.apply_undo_scene(scene)
+            else:
+                device.apply_scene(scene)
+
+    def learn_scene_values(self, channels: list, scenes: dict[str, int]) -> None:
+        # Called with the output channels read after scene calls and the
+        # scene of every device by dSUID at the time the read was started
+        devices: dict[str, tuple[Any, list]] = {}
+        for channel in channels:
+            if channel.device.dsuid in scenes:
+                devices.setdefault(channel.device.dsuid, (channel.device, []))[
+                    1
+                ].append(channel)
+        changed = False
+        for dsuid, (device, device_channels) in devices.items():
+            if device.learn_scene_values(scenes[dsuid], device_channels):
+                changed = True
+        if changed:
+            for callback in self.scene_values_callbacks:
+                callback()
+
+    def register_scene_values_callback(
+        self, callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        # Called when learn_scene_values() found new or changed scene values
+        if callback not in self.scene_values_callbacks:
+            self.scene_values_callbacks.append(callback)
+
+        def unregister_scene_values_callback() -> None:
+            if callback in self.scene_values_callbacks:
+                self.scene_values_callbacks.remove(callback)
+
+        return unregister_scene_values_callback
+
+    async def resync(self) -> None:
+        # Recover sensor values, binary inputs and availability changes that
+        # were missed while the websocket was disconnected
+        # Channels only notify their callbacks if the value actually changed
+        if len(self.devices) == 0:
+            return
+        data = await self.client.request(
+            "apartment/getDevices", max_age=0, priority=REQUEST_PRIORITY_EVENT
+        )
+        for d in data:
+            if (dsuid := d.get("dSUID")) and (device := self.devices.get(dsuid)):
+                self._load_device(device, d)
         self.find_split_devices()
-        return self.devices
+        for scene in self.scenes:
+            if scene.state_name is not None:
+                scene.force_update = True
+
+    async def update_output_values(
+        self,
+        channels: list,
+        priority: int | None = None,
+        max_age: float | None = None,
+    ) -> bool:
+        # Read the target values of the given output channels from the dSS
+        # property tree, one property query per channel id instead of one bus
+        # read per device. Returns False if the values have to be read per
+        # device, a single failure of a query that worked before is raised.
+        # priority and max_age are passed to DigitalstromClient.request.
+        if not self.output_query.should_try():
+            return False
+        by_channel_id: dict[str, dict[str, list]] = {}
+        for channel in channels:
+            by_channel_id.setdefault(channel.channel_id, {}).setdefault(
+                channel.device.dsuid, []
+            ).append(channel)
+        async with self._output_values_lock:
+            for channel_id, device_channels in by_channel_id.items():
+                try:
+                    values = await self._query_target_values(
+                        channel_id, priority, max_age
+                    )
+                except ServerError as e:
+                    self.logger.debug(f"Reading output values via query failed: {e}")
+                    if self.output_query.record_failure():
+                        return False
+                    raise
+                for dsuid, value in values.items():
+                    for channel in device_channels.get(dsuid, []):
+                        if channel.last_value != value:
+                            channel.update(value)
+            self.output_query.record_success()
+        return True
+
+    async def update_power_states(
+        self,
+        channels: list,
+        priority: int | None = None,
+        max_age: float | None = None,
+    ) -> bool:
+        # Read the power state of the devices of the given power state
+        # channels with one property query and report it on the channels.
+        # Returns False if the power states have to be read per device.
+        if not self.power_state_query.should_try():
+            return False
+        try:
+            values = await self._query_target_values("powerState", priority, max_age)
+        except ServerError as e:
+            self.logger.debug(f"Reading power states via query failed: {e}")
+            values = {}
+        if len(values) == 0:
+            # Keep the power states until the query is tried again, unless it
+            # is given up
+            return not self.power_state_query.record_failure()
+        self.power_state_query.record_success()
+        for channel in channels:
+            if (
+                value := values.get(channel.device.dsuid)
+            ) is not None and channel.last_value != value:
+                channel.update(value)
+        return True
+
+    async def _query_target_values(
+        self, output: str, priority: int | None = None, max_age: float | None = None
+    ) -> dict[str, float]:
+        result = await self.client.request(
+            f"property/query?query=/apartment/zones/*(ZoneID)/devices/*(dSUID)/status/outputs/{output}(targetValue)",
+            max_age=max_age,
+            priority=priority,
+        )
+        values: dict[str, float] = {}
+        self._collect_target_values(result, None, values)
+        return values
+
+    def _collect_target_values(
+        self, node: dict | list, dsuid: str | None, values: dict[str, float]
+    ) -> None:
+        # Zones and devices are nested lists in the query result, the device
+        # a value belongs to is the closest enclosing node with a dSUID
+        if isinstance(node, list):
+            for item in node:
+                self._collect_target_values(item, dsuid, values)
+        elif isinstance(node, dict):
+            dsuid = node.get("dSUID", dsuid)
+            if dsuid is not None and (value := node.get("targetValue")) is not None:
+                values[dsuid] = float(value)
+            for item in node.values():
+                if isinstance(item, (dict, list)):
+                    self._collect_target_values(item, dsuid, values)
+
+    async def update_scene_states(self) -> None:
+        # Read all apartment states (/usr/states) with one property query,
+        # scenes only fall back to reading their own state if that fails
+        scenes = [
+            scene
+            for scene in self.scenes
+            if scene.state_name is not None and scene.on_state is not None
+        ]
+        if self.state_query.should_try():
+            states: dict[str, str] = {}
+            try:
+                result = await self.client.request(
+                    "property/query?query=/usr/states/*(name,state)"
+                )
+                self._collect_states(result, states)
+            except ServerError as e:
+                self.logger.debug(f"Reading states via query failed: {e}")
+            if len(states) > 0:
+                self.state_query.record_success()
+                for scene in scenes:
+                    scene.update_from_state(states.get(scene.state_name))
+                return
+            if not self.state_query.record_failure():
+                # Keep the states until the query is tried again
+                return
+        for scene in scenes:
+            await scene.get_value()
+
+    def _collect_states(self, node: dict | list, states: dict[str, str]) -> None:
+        if isinstance(node, list):
+            for item in node:
+                self._collect_states(item, states)
+        elif isinstance(node, dict):
+            if isinstance(name := node.get("name"), str) and isinstance(
+                state := node.get("state"), str
+            ):
+                states[name] = state
+            for item in node.values():
+                if isinstance(item, (dict, list)):
+                    self._collect_states(item, states)
+
+    async def get_modbus_meter_values(self) -> dict[str, float]:
+        # Values of all meterings from the REST API, indexed by meter id
+        data = await self.client.request("apartment/meterings/values")
+        values = {}
+        for entry in (data.get("data") or {}).get("values") or []:
+            if (meter_id := entry.get("id")) is None:
+                continue
+            value = (entry.get("attributes") or {}).get("value")
+            if value is not None:
+                values[meter_id] = float(value)
+        return values
+
+    async def update_meter_values(self, meter_type: str) -> None:
+        # Read the latest power (W) or energy (Ws) value of all circuits with
+        # one metering/getLatest request instead of one request per circuit
+        circuits = [c for c in self.circuits.values() if c.has_metering]
+        if len(circuits) == 0:
+            return
+        if self.metering_query.should_try():
+            if meter_type == "power":
+                url = "metering/getLatest?type=consumption&from=.meters(all)"
+            else:
+                url = "metering/getLatest?type=energy&from=.meters(all)&unit=Ws"
+            try:
+                data = await self.client.request(url)
+            except ServerError as e:
+                self.logger.debug(f"Reading meter values via getLatest failed: {e}")
+                data = None
+            if data is not None and (values := data.get("values")) is not None:
+                self.metering_query.record_success()
+                by_dsid = {c.dsid: c for c in circuits}
+                for entry in values:
+                    circuit = self.circuits.get(entry.get("dSUID")) or by_dsid.get(
+                        entry.get("dsid")
+                    )
+                    if (
+                        circuit is not None
+                        and (sensor := circuit.sensors.get(meter_type)) is not None
+                        and (value := entry.get("value")) is not None
+                    ):
+                        sensor.update(float(value))
+                return
+            if not self.metering_query.record_failure():
+                # Keep the values until the query is tried again
+                return
+        for circuit in circuits:
+            if (sensor := circuit.sensors.get(meter_type)) is not None:
+                sensor.update(await sensor.get_value())
 
     async def get_circuits(self) -> dict:
         data = await self.client.request("apartment/getCircuits")
         self.logger.debug(f"getCircuits {data}")
         if circuits := data.get("circuits"):
-            for d in circuits:
-                if (dsuid := d.get("dSUID")) and (len(dsuid) > 0):
-                    if dsuid not in self.circuits.keys():
-                        from .circuit import DigitalstromCircuit
-
-                        circuit = DigitalstromCircuit(self.client, self, dsuid)
-                        self.circuits[dsuid] = circuit
-                    self.circuits[dsuid].load_from_dict(d)
+            self.load_circuits_from_list(circuits)
         return self.circuits
 
-    async def get_zones(self) -> dict:
+    def load_circuits_from_list(self, data: list) -> None:
+        present = set()
+        for d in data:
+            if (dsuid := d.get("dSUID")) and (len(dsuid) > 0):
+                if dsuid not in self.circuits.keys():
+                    from .circuit import DigitalstromCircuit
+
+                    circuit = DigitalstromCircuit(self.client, self, dsuid)
+                    self.circuits[dsuid] = circuit
+                self.circuits[dsuid].load_from_dict(d)
+                present.add(dsuid)
+        if len(present) > 0:
+            for dsuid in [k for k in self.circuits.keys() if k not in present]:
+                del self.circuits[dsuid]
+            self.structure_data["circuits"] = data
+
+    async def get_zones(self, load_scenes: bool = True) -> dict:
         data = await self.client.request("apartment/getReachableGroups")
         self.logger.debug(f"getReachableGroups {data}")
         if zones := data.get("zones"):
-            for z in zones:
-                if "zoneID" in z:
-                    zone_id = int(z["zoneID"])
-                    if zone_id not in self.zones.keys():
-                        from .zone import DigitalstromZone
-
-                        zone = DigitalstromZone(self.client, self, zone_id)
-                        self.zones[zone_id] = zone
-                    self.zones[zone_id].load_from_dict(z)
+            self.load_zones_from_list(zones)
+            if load_scenes:
+                for zone in self.zones.values():
                     await zone.get_scenes()
         await self.get_zone_climate_data()
         return self.zones
 
+    def load_zones_from_list(self, data: list) -> None:
+        present = set()
+        for z in data:
+            if "zoneID" in z:
+                zone_id = int(z["zoneID"])
+                if zone_id not in self.zones.keys():
+                    from .zone import DigitalstromZone
+
+                    zone = DigitalstromZone(self.client, self, zone_id)
+                    self.zones[zone_id] = zone
+                self.zones[zone_id].load_from_dict(z)
+                present.add(zone_id)
+        if len(present) > 0:
+            for zone_id in [k for k in self.zones.keys() if k not in present]:
+                del self.zones[zone_id]
+            self.structure_data["zones"] = data
+
+    async def load_structure(
+        self, max_concurrency: int = STRUCTURE_LOAD_CONCURRENCY
+    ) -> dict[str, float]:
+        # Load zones, scenes, circuits and devices with the independent
+        # requests running concurrently, at most `max_concurrency` at a time
+        # Returns the duration of every phase in seconds
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        timings: dict[str, float] = {}
+
+        async def limited(func: Callable[..., Awaitable], *args: Any) -> Any:
+            async with semaphore:
+                return await func(*args)
+
+        async def timed(phase: str, func: Callable[..., Awaitable], *args: Any) -> Any:
+            start = time.monotonic()
+            try:
+                return await func(*args)
+            finally:
+                timings[phase] = time.monotonic() - start
+
+        async def load_scenes() -> None:
+            groups = [
+                (zone, group_id)
+                for zone in self.zones.values()
+                for group_id in zone.group_ids
+            ]
+            results = await asyncio.gather(
+                *[
+                    limited(zone.get_reachable_scenes, group_id)
+                    for zone, group_id in groups
+                ]
+            )
+            # Create the scenes in a stable order regardless of response order
+            for (zone, group_id), result in zip(groups, results):
+                zone.load_scenes_from_dict(group_id, result)
+
+        async def load_zones() -> None:
+            await timed("zones", limited, self.get_zones, False)
+            await timed("scenes", load_scenes)
+
+        start = time.monotonic()
+        await asyncio.gather(
+            load_zones(),
+            timed("circuits", limited, self.get_circuits),
+            timed("devices", limited, self.get_devices),
+        )
+        timings["total"] = time.monotonic() - start
+        self.structure_load_timings = timings
+        self.logger.debug(
+            "Apartment structure loaded in %.2f s (%s)",
+            timings["total"],
+            ", ".join(f"{k}: {v:.2f} s" for k, v in timings.items() if k != "total"),
+        )
+        return timings
+
     async def get_zone_climate_data(self) -> None:
         data = await self.client.request("apartment/getTemperatureControlStatus")
         if zones := data.get("zones"):
             self.logger.debug(f"getTemperatureControlStatus {data}")
-            for z in zones:
-                if "id" in z:
-                    zone_id = int(z["id"])
-                    if zone_id in self.zones.keys():
-                        self.zones[zone_id].load_climate_data_from_dict(z)
+            self.load_climate_data_from_list(zones)
+
+    def load_climate_data_from_list(self, data: list) -> None:
+        for z in data:
+            if "id" in z:
+                zone_id = int(z["id"])
+                if zone_id in self.zones.keys():
+                    self.zones[zone_id].load_climate_data_from_dict(z)
+        self.structure_data["climate"] = data
+
+    def get_structure_snapshot(self) -> dict:
+        # The dSS responses the structure was parsed from, restoring them with
+        # load_structure_snapshot() results in the same zones, scenes,
+        # circuits, devices and channels without any requests, together with
+        # the scene values learned so far
+        return {
+            "zones": self.structure_data.get("zones", []),
+            "scenes": [
+                {"zoneID": zone.zone_id, "groupID": group_id, "data": data}
+                for zone in self.zones.values()
+                for group_id, data in zone.scene_data.items()
+            ],
+            "climate": self.structure_data.get("climate", []),
+            "circuits": self.structure_data.get("circuits", []),
+            "devices": self.structure_data.get("devices", []),
+            "parents": {
+                device.dsuid: device.parent_device.dsuid
+                for device in self.devices.values()
+                if device.parent_device is not None
+            },
+            "scene_values": {
+                device.dsuid: {
+                    str(scene): {str(index): value for index, value in values.items()}
+                    for scene, values in device.scene_values.items()
+                }
+                for device in self.devices.values()
+                if device.scene_values
+            },
+        }
+
+    def load_structure_snapshot(self, snapshot: dict) -> None:
+        self.load_zones_from_list(snapshot.get("zones", []))
+        for entry in snapshot.get("scenes", []):
+            if (zone := self.zones.get(int(entry["zoneID"]))) is not None:
+                zone.load_scenes_from_dict(int(entry["groupID"]), entry["data"])
+        self.load_climate_data_from_list(snapshot.get("climate", []))
+        # Presence, sensor values and binary input states are as old as the
+        # snapshot, they stay unknown until the live structure is loaded
+        self.load_circuits_from_list(
+            [
+                {k: v for k, v in c.items() if k != "isPresent"}
+                for c in snapshot.get("circuits", [])
+            ]
+        )
+        self.load_devices_from_list(
+            [self._without_live_state(d) for d in snapshot.get("devices", [])]
+        )
+        # The saved parents replace the split device detection
+        self._split_dirty.clear()
+        for dsuid, parent_dsuid in snapshot.get("parents", {}).items():
+            if (device := self.devices.get(dsuid)) is not None and (
+                parent_device := self.devices.get(parent_dsuid)
+            ) is not None:
+                self.merge_devices(parent_device, device)
+        for dsuid, scene_values in snapshot.get("scene_values", {}).items():
+            if (device := self.devices.get(dsuid)) is not None:
+                device.load_scene_values(scene_values)
+
+    def _without_live_state(self, data: dict) -> dict:
+        device = {k: v for k, v in data.items() if k != "isPresent"}
+        if sensors := data.get("sensors"):
+            device["sensors"] = [
+                {k: v for k, v in s.items() if k not in ("value", "valid")}
+                for s in sensors
+            ]
+        if binary_inputs := data.get("binaryInputs"):
+            device["binaryInputs"] = [
+                {k: v for k, v in b.items() if k != "state"} for b in binary_inputs
+            ]
+        return device
+
+    def register_structure_callback(
+        self, callback: Callable[[dict[str, list[str]]], None]
+    ) -> Callable[[], None]:
+        # Called with the dSUIDs of added, removed and changed devices and
+        # circuits after refresh_structure()
+        if callback not in self.structure_callbacks:
+            self.structure_callbacks.append(callback)
+
+        def unregister_structure_callback() -> None:
+            if callback in self.structure_callbacks:
+                self.structure_callbacks.remove(callback)
+
+        return unregister_structure_callback
+
+    async def refresh_structure(self) -> dict[str, list[str]]:
+        # Re-read circuits and devices and report only what actually changed
+        old_signatures = {
+            dsuid: device.get_structure_signature()
+            for dsuid, device in self.devices.items()
+        }
+        old_signatures.update(
+            {dsuid: (circuit.name,) for dsuid, circuit in self.circuits.items()}
+        )
+        await self.get_circuits()
+        await self.get_devices()
+        new_signatures = {
+            dsuid: device.get_structure_signature()
+            for dsuid, device in self.devices.items()
+        }
+        new_signatures.update(
+            {dsuid: (circuit.name,) for dsuid, circuit in self.circuits.items()}
+        )
+        changes = {
+            "added": [k for k in new_signatures.keys() if k not in old_signatures],
+            "removed": [k for k in old_signatures.keys() if k not in new_signatures],
+            "changed": [
+                k
+                for k, v in new_signatures.items()
+                if k in old_signatures and old_signatures[k] != v
+            ],
+        }
+        self.logger.debug(
+            "Structure refreshed: %i added, %i removed, %i changed",
+            len(changes["added"]),
+            len(changes["removed"]),
+            len(changes["changed"]),
+        )
+        if any(len(v) > 0 for v in changes.values()):
+            for callback in self.structure_callbacks:
+                callback(changes)
+        return changes
+
+    def _on_structure_changed(self, data: dict) -> None:
+        # The dSS sends these events in bursts, refresh once it settled
+        if self._structure_refresh_handle is not None:
+            self._structure_refresh_handle.cancel()
+        self._structure_refresh_handle = asyncio.get_running_loop().call_later(
+            STRUCTURE_REFRESH_DELAY, self._start_structure_refresh
+        )
+
+    def _start_structure_refresh(self) -> None:
+        self._structure_refresh_handle = None
+        if (
+            self._structure_refresh_task is not None
+            and not self._structure_refresh_task.done()
+        ):
+            # Refresh again after the running one, it may have missed changes
+            self._on_structure_changed({})
+            return
+        self._structure_refresh_task = asyncio.ensure_future(
+            self._refresh_structure_logged()
+        )
+
+    async def _refresh_structure_logged(self) -> None:
+        try:
+            await self.refresh_structure()
+        except (CannotConnect, InvalidAuth, ServerError) as e:
+            self.logger.warning(f"Refreshing the apartment structure failed: {e}")
+
+    def close(self) -> None:
+        if self._structure_refresh_handle is not None:
+            self._structure_refresh_handle.cancel()
+            self._structure_refresh_handle = None
+        if (
+            self._structure_refresh_task is not None
+            and not self._structure_refresh_task.done()
+        ):
+            self._structure_refresh_task.cancel()
+        self._structure_refresh_task = None
+
+    def register_event_handler(
+        self, name: str, handler: Callable[[dict], bool | None]
+    ) -> Callable[[], None]:
+        # Handlers for the same event run in registration order, a handler
+        # returning True consumes the event for the following handlers
+        handlers = self._event_handlers.setdefault(name, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+        def unregister_event_handler() -> None:
+            if handler in handlers:
+                handlers.remove(handler)
+            if len(handlers) == 0 and self._event_handlers.get(name) is handlers:
+                del self._event_handlers[name]
+
+        return unregister_event_handler
 
     async def event_callback(self, data: dict) -> None:
-        if name := data.get("name"):
-            self.logger.debug(f"event {data}")
-            if name == "deviceSensorValue":
-                dsuid = data["source"]["dsid"]
-                index = int(data["properties"]["sensorIndex"])
-                value = float(data["properties"]["sensorValueFloat"])
-                if (device := self.devices.get(dsuid)) and (
-                    sensor := device.sensors.get(index)
-                ):
-                    sensor.update(value)
-                    device.update_availability(True)
-
-            elif name == "deviceBinaryInputEvent":
-                dsuid = data["source"]["dsid"]
-                index = int(data["properties"]["inputIndex"])
-                raw_state = int(data["properties"]["inputState"])
-                state = raw_state > 0
-                if (device := self.devices.get(dsuid)) and (
-                    binary_sensor := device.binary_inputs.get(index)
-                ):
-                    binary_sensor.update(state, raw_state)
-                    device.update_availability(True)
+        # Events nobody subscribed to are dropped before touching their fields
+        if (handlers := self._event_handlers.get(data.get("name"))) is None:
+            return
+        self.logger.debug("event %s", data)
+        for handler in handlers:
+            if handler(data):
+                return
 
-            elif name == "stateChange":
-                state = data["properties"]["state"]
-                if (dsuid := data["source"].get("dSUID")) and (
-                    device := self.devices.get(dsuid)
-                ):
-                    if state == "unknown":
-                        device.update_availability(False)
-                        # TODO: clear output channels last_value
-                    else:
-                        device.update_availability(True)
+    def _on_device_sensor_value(self, data: dict) -> None:
+        dsuid = data["source"]["dsid"]
+        index = int(data["properties"]["sensorIndex"])
+        value = float(data["properties"]["sensorValueFloat"])
+        if (device := self.get_device(dsuid)) and (
+            sensor := device.sensors.get(index)
+        ):
+            sensor.update(value)
+            device.update_availability(True)
 
-            elif name == "DeviceEvent":
-                if (
-                    (action := data["properties"]["action"])
-                    and (dsuid := data["source"].get("dsid"))
-                    and (device := self.devices.get(dsuid))
-                ):
-                    if action == "ready":
-                        device.update_availability(True)
-                    if action == "removed":
-                        device.update_availability(False)
-                        # TODO: clear output channels
-
-            elif name in ["callScene", "callSceneBus"]:
-                dsuid = data["properties"].get(
-                    "originDSUID", data["source"].get("dsid", None)
-                )
-                if (device := self.devices.get(dsuid)) and (device.button is not None):
-                    if name == "callSceneBus":
-                        device.button.bus_event_received = time.time()
-                    elif (device.button.bus_event_received is not None) and (
-                        device.button.bus_event_received
-                        > time.time() - BUTTON_BUS_EVENT_TIMEOUT
-                    ):
-                        self.logger.debug(f"Ignoring repeated event")
-                        return
-                    scene_id = data["properties"]["sceneID"]
-                    if data["source"]["isDevice"]:
-                        extra_data = {}
-                        extra_data["scene_id"] = scene_id
-                        device.button.update("call_device_scene", extra_data)
-                        device.update_availability(True)
-                    if (
-                        (data["source"]["isGroup"])
-                        and (group_id := data["source"].get("groupID"))
-                        and (zone_id := data["source"].get("zoneID"))
-                    ):
-                        extra_data = {}
-                        extra_data["scene_id"] = scene_id
-                        extra_data["group_id"] = group_id
-                        extra_data["zone_id"] = zone_id
-                        device.button.update("call_group_scene", extra_data)
-                        device.update_availability(True)
-
-            if name in ["callScene", "undoScene"]:
-                scene_id = int(data["properties"].get("sceneID", None))
-                if scene_id >= 64:
-                    for scene in self.scenes:
-                        if (
-                            scene_id in [scene.call_number, scene.undo_number]
-                            and scene.state_name is not None
-                        ):
-                            scene.force_update = True
-
-            elif name == "buttonClick":
-                dsuid = data["source"]["dsid"]
-                button_index = int(data["properties"]["buttonIndex"])
+    def _on_device_binary_input_event(self, data: dict) -> None:
+        dsuid = data["source"]["dsid"]
+        index = int(data["properties"]["inputIndex"])
+        raw_state = int(data["properties"]["inputState"])
+        state = raw_state > 0
+        if (device := self.get_device(dsuid)) and (
+            binary_sensor := device.binary_inputs.get(index)
+        ):
+            binary_sensor.update(state, raw_state)
+            device.update_availability(True)
+
+    def _on_state_change(self, data: dict) -> None:
+        state = data["properties"]["state"]
+        if (dsuid := data["source"].get("dSUID")) and (
+            device := self.get_device(dsuid)
+        ):
+            if state == "unknown":
+                device.update_availability(False)
+                # TODO: clear output channels last_value
+            else:
+                device.update_availability(True)
+
+    def _on_apartment_state_change(self, data: dict) -> None:
+        if (state_name := data["properties"].get("statename")) is None:
+            return
+        for scene in self.scenes:
+            if scene.state_name == state_name and scene.on_state is not None:
+                scene.update_from_state(data["properties"].get("state"))
+
+    def _on_device_event(self, data: dict) -> None:
+        if (
+            (action := data["properties"]["action"])
+            and (dsuid := data["source"].get("dsid"))
+            and (device := self.get_device(dsuid))
+        ):
+            if action == "ready":
+                device.update_availability(True)
+            if action == "removed":
+                device.update_availability(False)
+                # TODO: clear output channels
+
+    def _on_button_scene(self, data: dict) -> bool:
+        name = data["name"]
+        dsuid = data["properties"].get("originDSUID", data["source"].get("dsid", None))
+        if (device := self.get_device(dsuid)) and (device.button is not None):
+            if name == "callSceneBus":
+                device.button.bus_event_received = time.time()
+            elif (device.button.bus_event_received is not None) and (
+                device.button.bus_event_received > time.time() - BUTTON_BUS_EVENT_TIMEOUT
+            ):
+                self.logger.debug("Ignoring repeated event")
+                return True
+            scene_id = data["properties"]["sceneID"]
+            if data["source"]["isDevice"]:
+                extra_data = {}
+                extra_data["scene_id"] = scene_id
+                device.button.update("call_device_scene", extra_data)
+                device.update_availability(True)
+            if (
+                (data["source"]["isGroup"])
+                and (group_id := data["source"].get("groupID"))
+                and (zone_id := data["source"].get("zoneID"))
+            ):
+                extra_data = {}
+                extra_data["scene_id"] = scene_id
+                extra_data["group_id"] = group_id
+                extra_data["zone_id"] = zone_id
+                device.button.update("call_group_scene", extra_data)
+                device.update_availability(True)
+        return False
+
+    def _on_apartment_scene(self, data: dict) -> None:
+        scene_id = int(data["properties"].get("sceneID", None))
+        if scene_id >= 64:
+            for scene in self.scenes:
                 if (
-                    (device := self.devices.get(dsuid))
-                    and (device.button is not None)
-                    and (button_index == 0)
+                    scene_id in [scene.call_number, scene.undo_number]
+                    and scene.state_name is not None
                 ):
-                    extra_data = {}
-                    extra_data["click_type"] = int(data["properties"]["clickType"])
-                    extra_data["hold_count"] = int(
-                        data["properties"].get("holdCount", 0)
-                    )
-                    device.button.update("button", extra_data)
-                    device.update_availability(True)
-
-            # elif name == "apartmentProxyDeviceTimeout": # Cover reached end position
-            #     if (dsuid := data["source"].get("dsid")) and (
-            #         device := self.devices.get(dsuid)
-            #     ):
-            #         await device.output_channels_get_values() # TODO
-            # elif name == "apartmentProxyStateChanged":
-            #     # TODO: Update all output channels
-            #     pass
+                    scene.force_update = True
+
+    def _on_output_scene(self, data: dict) -> None:
+        # The outputs are read again by the poll coordinator, until then they
+        # show the values the scene is known to set
+        scene = int(data["properties"]["sceneID"])
+        undo = data["name"] == "undoScene"
+        for device in self.get_scene_event_devices(data):
+            if undo:
+                device.apply_undo_scene(scene)
+            else:
+                device.apply_scene(scene)
+
+    def _on_button_click(self, data: dict) -> None:
+        dsuid = data["source"]["dsid"]
+        button_index = int(data["properties"]["buttonIndex"])
+        if (
+            (device := self.get_device(dsuid))
+            and (device.button is not None)
+            and (button_index == 0)
+        ):
+            extra_data = {}
+            extra_data["click_type"] = int(data["properties"]["clickType"])
+            extra_data["hold_count"] = int(data["properties"].get("holdCount", 0))
+            device.button.update("button", extra_data)
+            device.update_availability(True)
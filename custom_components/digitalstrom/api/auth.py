@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import time
+from typing import TYPE_CHECKING
+
+from .const import SESSION_TOKEN_RENEWAL_MARGIN, SESSION_TOKEN_TIMEOUT
+
+if TYPE_CHECKING:
+    from .client import DigitalstromClient
+
+
+class DigitalstromSessionTokenManager:
+    # Shared session token for the JSON API, the REST API and the websocket
+    # Concurrent refreshes are merged into a single login request and the
+    # token is renewed in the background shortly before the dSS expires it,
+    # as long as requests keep using it
+    def __init__(self, client: "DigitalstromClient"):
+        self.client = client
+        self.logger = logging.getLogger("digitalstrom_api")
+        self.token: str | None = None
+        self.last_used: float | None = None
+        self.logins = 0
+        self.failed_logins = 0
+        self._login_task: asyncio.Task | None = None
+        self._renewal_handle: asyncio.TimerHandle | None = None
+
+    def is_valid(self) -> bool:
+        return (
+            self.token is not None
+            and self.last_used is not None
+            and self.last_used > time.time() - SESSION_TOKEN_TIMEOUT
+        )
+
+    async def get_token(self) -> str:
+        # Return a valid session token, logging in only if there is none
+        if self.is_valid():
+            return self.token
+        return await self.refresh()
+
+    async def refresh(self) -> str:
+        # Request a new session token, callers arriving while a login is
+        # already in flight wait for that login instead of starting another
+        if self._login_task is None or self._login_task.done():
+            self._login_task = asyncio.ensure_future(self._login())
+        return await asyncio.shield(self._login_task)
+
+    async def _login(self) -> str:
+        try:
+            token = await self.client.request_session_token()
+        except Exception:
+            self.failed_logins += 1
+            raise
+        self.logins += 1
+        self.token = token
+        # Only renewed in the background once a request used it, an unused
+        # token lapses and the next request logs in again
+        self.last_used = time.time()
+        self._cancel_renewal()
+        return token
+
+    def mark_used(self) -> None:
+        # The dSS extends the session on every request, so the renewal is
+        # rescheduled relative to the last successful use of the token
+        self.last_used = time.time()
+        self._schedule_renewal()
+
+    def invalidate(self, token: str | None = None) -> None:
+        # Drop the token, optionally only if it is still the given one
+        if token is None or token == self.token:
+            self.token = None
+            self.last_used = None
+            self._cancel_renewal()
+
+    def close(self) -> None:
+        self._cancel_renewal()
+        if self._login_task is not None and not self._login_task.done():
+            self._login_task.cancel()
+        self._login_task = None
+
+    def _schedule_renewal(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._cancel_renewal()
+        delay = max(SESSION_TOKEN_TIMEOUT - SESSION_TOKEN_RENEWAL_MARGIN, 0)
+        self._renewal_handle = loop.call_later(delay, self._start_renewal)
+
+    def _cancel_renewal(self) -> None:
+        if self._renewal_handle is not None:
+            self._renewal_handle.cancel()
+            self._renewal_handle = None
+
+    def _start_renewal(self) -> None:
+        self._renewal_handle = None
+        if self._login_task is None or self._login_task.done():
+            self._login_task = asyncio.ensure_future(self._login())
+            self._login_task.add_done_callback(self._renewal_done)
+
+    def _renewal_done(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            return
+        if (e := task.exception()) is not None:
+            # The next request logs in again on the hot path
+            self.logger.debug("Background session token renewal failed: %s", e)
+            self.invalidate()
@@ -0,0 +1,121 @@
+import time
+
+from .const import (
+    BREAKER_COOLDOWN,
+    BREAKER_FAILURE_THRESHOLD,
+    QUERY_FAILURE_THRESHOLD,
+    QUERY_RETRY_INTERVAL,
+)
+from .exceptions import CannotConnect
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+class DigitalstromCircuitBreaker:
+    # Client-wide breaker for connection failures (not related to dSM circuits)
+    # After `failure_threshold` consecutive failures all requests fail fast
+    # for `cooldown` seconds. Afterwards a single probe request is let
+    # through, its result decides whether the breaker closes or reopens.
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        cooldown: float = BREAKER_COOLDOWN,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.state = BREAKER_CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: float | None = None
+        self.times_opened = 0
+        self.rejected_requests = 0
+        self._probe_running = False
+
+    def before_request(self) -> None:
+        # Raise CannotConnect instead of sending a request that would time out
+        if self.state == BREAKER_CLOSED:
+            return
+        if self.state == BREAKER_OPEN:
+            if self.opened_at is not None and (
+                time.monotonic() - self.opened_at < self.cooldown
+            ):
+                self.rejected_requests += 1
+                raise CannotConnect(
+                    f"dSS unreachable, next connection attempt in {self.retry_in():.0f} s"
+                )
+            self.state = BREAKER_HALF_OPEN
+        if self._probe_running:
+            self.rejected_requests += 1
+            raise CannotConnect("dSS unreachable, waiting for probe request")
+        self._probe_running = True
+
+    def retry_in(self) -> float:
+        if self.state != BREAKER_OPEN or self.opened_at is None:
+            return 0
+        return max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+
+    def record_success(self) -> None:
+        self.consecutive_failures = 0
+        self._probe_running = False
+        self.state = BREAKER_CLOSED
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        probe_failed = self.state == BREAKER_HALF_OPEN
+        self._probe_running = False
+        if probe_failed or self.consecutive_failures >= self.failure_threshold:
+            if self.state != BREAKER_OPEN:
+                self.times_opened += 1
+            self.state = BREAKER_OPEN
+            self.opened_at = time.monotonic()
+
+    def record_cancelled(self) -> None:
+        # A cancelled probe neither proves nor disproves connectivity
+        self._probe_running = False
+
+    def is_open(self) -> bool:
+        return self.state == BREAKER_OPEN and self.retry_in() > 0
+
+    def get_statistics(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected_requests": self.rejected_requests,
+            "retry_in": self.retry_in(),
+        }
+
+
+class DigitalstromQuerySupport:
+    # Whether a bulk query works on this dSS. A query that worked before is
+    # only given up after `failure_threshold` failures in a row, one that
+    # never worked right away. Either way it is tried again after
+    # `retry_interval` seconds.
+    def __init__(
+        self,
+        failure_threshold: int = QUERY_FAILURE_THRESHOLD,
+        retry_interval: float = QUERY_RETRY_INTERVAL,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.retry_interval = retry_interval
+        self.supported: bool | None = None
+        self.failures = 0
+        self.retry_at = 0.0
+
+    def should_try(self) -> bool:
+        return self.supported != False or time.monotonic() >= self.retry_at
+
+    def record_success(self) -> None:
+        self.supported = True
+        self.failures = 0
+
+    def record_failure(self) -> bool:
+        # Returns whether to fall back to the slower requests
+        self.failures += 1
+        if self.supported != True or self.failures >= self.failure_threshold:
+            self.supported = False
+            self.retry_at = time.monotonic() + self.retry_interval
+            return True
+        return False
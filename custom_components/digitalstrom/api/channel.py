@@ -1,3 +1,4 @@
+import sys
 from collections.abc import Callable
 
 from .circuit import DigitalstromCircuit
@@ -6,13 +7,18 @@ from .exceptions import ServerError
 
 
 class DigitalstromChannel:
+    __slots__ = ("device", "index", "update_callbacks", "last_value")
+
     def __init__(self, device: DigitalstromDevice, index: int | str):
         self.device = device
         self.index = index
-        self.update_callbacks: list[Callable] = []
+        # Most channels never get a callback, the list is allocated on demand
+        self.update_callbacks: list[Callable] | tuple = ()
         self.last_value: float | bool | str | None = None
 
     def register_update_callback(self, callback: Callable) -> Callable[[], None]:
+        if not self.update_callbacks:
+            self.update_callbacks = []
         if callback not in self.update_callbacks:
             self.update_callbacks.append(callback)
 
@@ -31,6 +37,8 @@ class DigitalstromChannel:
 
 
 class DigitalstromSensorChannel(DigitalstromChannel):
+    __slots__ = ("sensor_type", "valid")
+
     def __init__(
         self, device: DigitalstromDevice, index: int, sensor_type: int, valid: bool
     ):
@@ -40,6 +48,8 @@ class DigitalstromSensorChannel(DigitalstromChannel):
 
 
 class DigitalstromBinaryInputChannel(DigitalstromChannel):
+    __slots__ = ("input_type", "inverted")
+
     def __init__(
         self, device: DigitalstromDevice, index: int, input_type: int, inverted: bool
     ):
@@ -49,6 +59,8 @@ class DigitalstromBinaryInputChannel(DigitalstromChannel):
 
 
 class DigitalstromOutputChannel(DigitalstromChannel):
+    __slots__ = ("channel_id", "channel_name", "channel_type", "prepared_value")
+
     def __init__(
         self,
         device: DigitalstromDevice,
@@ -58,17 +70,19 @@ class DigitalstromOutputChannel(DigitalstromChannel):
         channel_type: str,
     ):
         super().__init__(device, index)
-        self.channel_id = channel_id
-        self.channel_name = channel_name
-        self.channel_type = channel_type
+        # The same few channel names repeat on every device
+        self.channel_id = sys.intern(channel_id)
+        self.channel_name = sys.intern(channel_name)
+        self.channel_type = sys.intern(channel_type)
         self.prepared_value: float | None = None
         self.last_value: float | None = None
 
     async def get_value(self) -> float | None:
         try:
-            result = await self.device.client.request(
-                f"property/getFloating?path=/apartment/zones/zone{self.device.zone_id}/devices/{self.device.dsuid}/status/outputs/{self.channel_id}/targetValue"
-            )
+            async with self.device.client.bus_scheduler.slot(self.device.meter_dsuid):
+                result = await self.device.client.request(
+                    f"property/getFloating?path=/apartment/zones/zone{self.device.zone_id}/devices/{self.device.dsuid}/status/outputs/{self.channel_id}/targetValue"
+                )
             self.last_value = result.get("value", None)
         except ServerError:
             self.last_value = None
@@ -83,13 +97,27 @@ class DigitalstromOutputChannel(DigitalstromChannel):
         self.prepared_value = value
 
 
+class DigitalstromPowerStateChannel(DigitalstromChannel):
+    # Power state of the output of a device with a powerLevel channel, read
+    # from powerState instead of the output channel value
+    __slots__ = ()
+
+    def __init__(self, device: DigitalstromDevice):
+        super().__init__(device, "powerState")
+        self.last_value: float | None = None
+
+
 class DigitalstromButtonChannel(DigitalstromChannel):
+    __slots__ = ("bus_event_received",)
+
     def __init__(self, device: DigitalstromDevice):
         super().__init__(device, 0)
         self.bus_event_received: float | None = None
 
 
 class DigitalstromMeterSensorChannel(DigitalstromChannel):
+    __slots__ = ("circuit",)
+
     def __init__(self, circuit: DigitalstromCircuit, identifier: str):
         super().__init__(circuit, identifier)
         self.circuit = circuit
@@ -113,6 +141,8 @@ class DigitalstromMeterSensorChannel(DigitalstromChannel):
 
 
 class DigitalstromModbusMeterChannel(DigitalstromChannel):
+    __slots__ = ("meter_type", "meter_id", "meter_name", "apartment", "device_info")
+
     def __init__(self, apartment, meter_id: str, meter_type: str, meter_name: str = None, device_info: dict = None):
         super().__init__(apartment, meter_id)
         self.meter_type = meter_type
@@ -121,31 +151,10 @@ class DigitalstromModbusMeterChannel(DigitalstromChannel):
         self.apartment = apartment
         self.device_info = device_info or {}
         
-    async def get_value(self) -> float:
+    async def get_value(self) -> float | None:
+        # Power in W, energy in Wh
         try:
-            # Use the correct digitalSTROM API endpoint for meter values
-            values_data = await self.apartment.client.request("apartment/meterings/values")
-            # Handle the nested data structure: {'data': {'values': [...]}}
-            if data := values_data.get("data"):
-                if values := data.get("values"):
-                    for value_entry in values:
-                        if value_entry.get("id") == self.meter_id:
-                            attributes = value_entry.get("attributes", {})
-                            value = attributes.get("value", 0.0)
-                            
-                            # Return the actual meter value
-                            if self.meter_type == "power":
-                                # Return power value in watts
-                                return float(value)
-                            elif self.meter_type == "energy_consumed":
-                                # Return energy consumed in Wh
-                                return float(value)
-                            elif self.meter_type == "power_produced":
-                                # Return power produced in watts
-                                return float(value)
-                            elif self.meter_type == "energy_produced":
-                                # Return energy produced in Wh
-                                return float(value)
+            values = await self.apartment.get_modbus_meter_values()
         except Exception:
-            pass
-        return None
+            return None
+        return values.get(self.meter_id)
@@ -4,6 +4,24 @@ from .exceptions import ServerError
 
 
 class DigitalstromCircuit:
+    __slots__ = (
+        "client",
+        "dsuid",
+        "apartment",
+        "name",
+        "manufacturer",
+        "dsid",
+        "hw_name",
+        "hw_version",
+        "sw_version",
+        "available",
+        "has_metering",
+        "has_metering_producer",
+        "has_blinking",
+        "sensors",
+        "firmware_status",
+    )
+
     def __init__(
         self, client: DigitalstromClient, apartment: DigitalstromApartment, dsuid: str
     ):
@@ -23,6 +41,7 @@ class DigitalstromCircuit:
         self.has_metering_producer = False
         self.has_blinking = False
         self.sensors: dict[str, DigitalstromMeterSensorChannel] = {}
+        self.firmware_status: str | None = None
 
     def load_from_dict(self, data: dict) -> None:
         if (dsuid := data.get("dSUID")) and (dsuid == self.dsuid):
@@ -64,9 +83,10 @@ class DigitalstromCircuit:
             status = data.get("status")
             # if status not in ["ok", "error", "update"]:
             #    status = None
-            return status
         except ServerError:
-            return None
+            status = None
+        self.firmware_status = status
+        return status
 
     async def install_update(self) -> None:
         status = await self.update_available()
@@ -1,6 +1,8 @@
 import asyncio
 import binascii
 import json
+import logging
+import random
 import re
 import socket
 import time
@@ -10,14 +12,45 @@ from typing import Any
 
 import aiohttp
 
-from .const import EVENT_LISTENER_TIMEOUT, SESSION_TOKEN_TIMEOUT, SSL_FINGERPRINT_REGEX
+from .auth import DigitalstromSessionTokenManager
+from .breaker import DigitalstromCircuitBreaker
+from .const import (
+    CONNECTION_KEEPALIVE_TIMEOUT,
+    CONNECTION_LIMIT,
+    EVENT_LISTENER_TIMEOUT,
+    EVENT_QUEUE_DROP_SUPERSEDED,
+    EVENT_QUEUE_SIZE,
+    IDEMPOTENT_METHOD_PREFIXES,
+    IDEMPOTENT_REST_PATHS,
+    MAX_CONCURRENT_REQUESTS,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_RATE,
+    REQUEST_CACHE_MAX_ENTRIES,
+    REQUEST_CACHE_TTL,
+    REQUEST_PRIORITY_INTERACTIVE,
+    REQUEST_PRIORITY_POLL,
+    REQUEST_RETRY_ATTEMPTS,
+    REQUEST_RETRY_BASE_DELAY,
+    REQUEST_RETRY_MAX_DELAY,
+    REQUEST_TIMEOUT,
+    SSL_FINGERPRINT_REGEX,
+    WEBSOCKET_HEARTBEAT_INTERVAL,
+    WEBSOCKET_HEARTBEAT_TIMEOUT,
+    WEBSOCKET_RECONNECT_MAX_DELAY,
+    WEBSOCKET_RECONNECT_MIN_DELAY,
+    WEBSOCKET_STABLE_CONNECTION,
+)
+from .events import DigitalstromEventLag, DigitalstromEventQueue
 from .exceptions import (
     CannotConnect,
     InvalidAuth,
     InvalidCertificate,
     InvalidFingerprint,
+    ServerBusy,
     ServerError,
 )
+from .ratelimit import DigitalstromRateLimiter
+from .scheduler import DigitalstromBusScheduler, DigitalstromRequestScheduler
 
 
 class DigitalstromClient:
@@ -27,6 +60,11 @@ class DigitalstromClient:
         port: int,
         ssl: str | bool | None = None,
         loop: asyncio.AbstractEventLoop | None = None,
+        max_concurrent_requests: int = MAX_CONCURRENT_REQUESTS,
+        max_requests_per_second: float = RATE_LIMIT_RATE,
+        request_burst: int = RATE_LIMIT_BURST,
+        event_queue_size: int = EVENT_QUEUE_SIZE,
+        event_overflow_policy: str = EVENT_QUEUE_DROP_SUPERSEDED,
     ):
         # ssl:
         #  False -> Ignore server certificate
@@ -39,9 +77,39 @@ class DigitalstromClient:
         self.last_request: float | None = None
         self.last_event: float | None = None
         self._app_token: str | None = None
-        self._session_token: str | None = None
-        self._ws: aiohttp.ClientSession | None = None
+        self.auth = DigitalstromSessionTokenManager(self)
+        self.cache_ttl: float = REQUEST_CACHE_TTL
+        self.coalesced_requests = 0
+        self.cache_hits = 0
+        self._inflight_requests: dict[str, tuple[asyncio.Task, int]] = {}
+        self._response_cache: dict[str, tuple[float, dict]] = {}
+        self._cache_generation = 0
+        self.scheduler = DigitalstromRequestScheduler(max_concurrent_requests)
+        self.bus_scheduler = DigitalstromBusScheduler()
+        self.rate_limiter = DigitalstromRateLimiter(
+            max_requests_per_second, request_burst
+        )
+        self.breaker = DigitalstromCircuitBreaker()
+        self.retried_requests = 0
+        self._session: aiohttp.ClientSession | None = None
+        self._ws: aiohttp.ClientWebSocketResponse | None = None
+        self.connections_created = 0
+        self.connections_reused = 0
         self._event_callbacks: list[Callable[[dict], Awaitable[None]]] = []
+        self._event_queue = DigitalstromEventQueue(
+            event_queue_size, event_overflow_policy
+        )
+        self._event_dispatcher: asyncio.Task | None = None
+        self.event_lag = DigitalstromEventLag()
+        self.logger = logging.getLogger("digitalstrom_api")
+        self._event_supervisor: asyncio.Task | None = None
+        self._connection_callbacks: list[Callable[[], Awaitable[None]]] = []
+        self._connection_task: asyncio.Task | None = None
+        self.connected_since: float | None = None
+        self.connected_time = 0.0
+        self.last_heartbeat: float | None = None
+        self.reconnects = 0
+        self.heartbeat_timeouts = 0
         if type(ssl) is bool:
             self.ssl = None if ssl else False
         elif type(ssl) is str:
@@ -52,48 +120,100 @@ class DigitalstromClient:
                 )
             self.ssl = aiohttp.Fingerprint(binascii.unhexlify(ssl_clean))
 
-    async def _request_raw(self, url: str, cookies: dict | None = None) -> dict:
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Return the shared connection pool, creating it on first use
+        # Every new connection costs a TCP and TLS handshake on the dSS, so
+        # the JSON API, the REST API and the websocket all share one
+        # keep-alive pool for the lifetime of the client
         if type(self.ssl) is not bool and type(self.ssl) is not aiohttp.Fingerprint:
             raise InvalidFingerprint()
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(family=socket.AF_INET, ssl=self.ssl),
-            cookies=cookies,
-            loop=self._loop,
-        ) as session:
-            try:
-                async with session.get(
-                    url=f"https://{self.host}:{self.port}/json/{url}"
-                ) as response:
-                    if response.status not in [200, 403, 500]:
-                        raise ServerError(
-                            f"Unexpected status code received: {response.status}"
-                        )
-                    try:
-                        data = await response.json()
-                    except json.decoder.JSONDecodeError as e:
-                        raise ServerError(f"Failed to decode JSON: {e}") from None
-                    if (is_ok := data.get("ok")) and is_ok:
-                        if result := data.get("result"):
-                            return result
-                        elif status := data.get("status"):
-                            return {"status": status}
-                        return {}
-                    elif message := data.get("message"):
-                        if (
-                            "authentication failed" in message.lower()
-                            or response.status == 403
-                        ):
-                            raise InvalidAuth(message)
-                        else:
-                            raise ServerError(f"Error message received: {message}")
-                    raise ServerError(f"Unexpected JSON structure received: {data}")
-
-            except aiohttp.client_exceptions.ServerFingerprintMismatch as e:
-                raise InvalidCertificate(e) from None
-            except aiohttp.client_exceptions.ClientConnectorCertificateError as e:
-                raise InvalidCertificate(e) from None
-            except aiohttp.ClientError as e:
-                raise CannotConnect(e) from None
+        if self._session is None or self._session.closed:
+            trace_config = aiohttp.TraceConfig()
+            trace_config.on_connection_create_end.append(self._on_connection_created)
+            trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    family=socket.AF_INET,
+                    ssl=self.ssl,
+                    limit=CONNECTION_LIMIT,
+                    keepalive_timeout=CONNECTION_KEEPALIVE_TIMEOUT,
+                ),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trace_configs=[trace_config],
+                loop=self._loop,
+            )
+        return self._session
+
+    async def _on_connection_created(
+        self, session: aiohttp.ClientSession, context: Any, params: Any
+    ) -> None:
+        self.connections_created += 1
+
+    async def _on_connection_reused(
+        self, session: aiohttp.ClientSession, context: Any, params: Any
+    ) -> None:
+        self.connections_reused += 1
+
+    def _token_headers(self, token: str | None) -> dict:
+        # The session token is sent as cookie, the shared pool doesn't keep one
+        return {} if token is None else {"Cookie": f"token={token}"}
+
+    def get_connection_statistics(self) -> dict:
+        # Every created connection corresponds to one TCP and TLS handshake
+        total = self.connections_created + self.connections_reused
+        return {
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused,
+            "handshakes": self.connections_created,
+            "reuse_rate": (self.connections_reused / total) if total > 0 else None,
+        }
+
+    async def _request_raw(self, url: str, token: str | None = None) -> dict:
+        session = self._get_session()
+        try:
+            async with session.get(
+                url=f"https://{self.host}:{self.port}/json/{url}",
+                headers=self._token_headers(token),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                if response.status > 500:
+                    # Status 500 carries the error message of a request the
+                    # dSS rejected, the other 5xx codes mean it is overloaded
+                    raise ServerBusy(
+                        f"Unexpected status code received: {response.status}"
+                    )
+                if response.status not in [200, 403, 500]:
+                    raise ServerError(
+                        f"Unexpected status code received: {response.status}"
+                    )
+                try:
+                    data = await response.json()
+                except json.decoder.JSONDecodeError as e:
+                    raise ServerError(f"Failed to decode JSON: {e}") from None
+                if (is_ok := data.get("ok")) and is_ok:
+                    if result := data.get("result"):
+                        return result
+                    elif status := data.get("status"):
+                        return {"status": status}
+                    return {}
+                elif message := data.get("message"):
+                    if (
+                        "authentication failed" in message.lower()
+                        or response.status == 403
+                    ):
+                        raise InvalidAuth(message)
+                    else:
+                        raise ServerError(f"Error message received: {message}")
+                raise ServerError(f"Unexpected JSON structure received: {data}")
+
+        except aiohttp.client_exceptions.ServerFingerprintMismatch as e:
+            raise InvalidCertificate(e) from None
+        except aiohttp.client_exceptions.ClientConnectorCertificateError as e:
+            raise InvalidCertificate(e) from None
+        except aiohttp.ClientError as e:
+            raise CannotConnect(e) from None
+        except asyncio.TimeoutError:
+            raise CannotConnect(f"Request timed out after {REQUEST_TIMEOUT} s") from None
 
     async def request_session_token(self) -> str:
         data = await self._request_raw(
@@ -136,69 +256,201 @@ class DigitalstromClient:
     def set_app_token(self, app_token: str | None) -> None:
         # Re-use the app token from a previous login, returned by request_app_token
         self._app_token = app_token
+        self.auth.invalidate()
 
     async def get_system_dsuid(self) -> str:
         # Get the dSUID for identifying the system without requiring a login
         data = await self._request_raw("system/getDSID")
         return str(data["dSUID"])
 
-    async def _request_rest_api(self, url: str) -> dict:
+    async def _request_rest_api(self, url: str, token: str | None = None) -> dict:
         # Make a request to the REST API (v1) instead of JSON API
-        if (self.last_request is None) or (
-            self.last_request < time.time() - SESSION_TOKEN_TIMEOUT
-        ):
-            self._session_token = await self.request_session_token()
-
-        async with aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(family=socket.AF_INET, ssl=self.ssl),
-            cookies=dict(token=self._session_token),
-            loop=self._loop,
-        ) as session:
-            try:
-                async with session.get(
-                    url=f"https://{self.host}:{self.port}/api/v1/{url}"
-                ) as response:
-                    if response.status not in [200, 403, 500]:
-                        raise ServerError(
-                            f"Unexpected status code received: {response.status}"
-                        )
-                    try:
-                        data = await response.json()
-                    except json.decoder.JSONDecodeError as e:
-                        raise ServerError(f"Failed to decode JSON: {e}") from None
-                    return data
-
-            except aiohttp.client_exceptions.ServerFingerprintMismatch as e:
-                raise InvalidCertificate(e) from None
-            except aiohttp.client_exceptions.ClientConnectorCertificateError as e:
-                raise InvalidCertificate(e) from None
-            except aiohttp.ClientError as e:
-                raise CannotConnect(e) from None
-
-    async def request(self, url: str) -> dict:
+        session = self._get_session()
+        try:
+            async with session.get(
+                url=f"https://{self.host}:{self.port}/api/v1/{url}",
+                headers=self._token_headers(token),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                if response.status == 403:
+                    raise InvalidAuth("Session token rejected by REST API")
+                if response.status > 500:
+                    raise ServerBusy(
+                        f"Unexpected status code received: {response.status}"
+                    )
+                if response.status not in [200, 500]:
+                    raise ServerError(
+                        f"Unexpected status code received: {response.status}"
+                    )
+                try:
+                    data = await response.json()
+                except json.decoder.JSONDecodeError as e:
+                    raise ServerError(f"Failed to decode JSON: {e}") from None
+                return data
+
+        except aiohttp.client_exceptions.ServerFingerprintMismatch as e:
+            raise InvalidCertificate(e) from None
+        except aiohttp.client_exceptions.ClientConnectorCertificateError as e:
+            raise InvalidCertificate(e) from None
+        except aiohttp.ClientError as e:
+            raise CannotConnect(e) from None
+        except asyncio.TimeoutError:
+            raise CannotConnect(f"Request timed out after {REQUEST_TIMEOUT} s") from None
+
+    def _is_idempotent(self, url: str) -> bool:
+        # Only read requests may share a response with other callers
+        path = url.split("?", 1)[0]
+        if path.startswith(IDEMPOTENT_REST_PATHS):
+            return True
+        method = path.rsplit("/", 1)[-1]
+        return method.startswith(IDEMPOTENT_METHOD_PREFIXES)
+
+    async def request(
+        self, url: str, max_age: float | None = None, priority: int | None = None
+    ) -> dict:
         # Send an authenticated request to the server
         # Previous login via request_app_token or set_app_token is required
+        # Identical read requests issued concurrently share one round trip and
+        # their response is reused for max_age seconds (default: cache_ttl)
+        # Requests are scheduled by priority, by default commands are treated
+        # as interactive and reads as background polls
+        if not self._is_idempotent(url):
+            # Anything written may invalidate previously read values, also
+            # the responses of reads still in flight
+            self._invalidate_cache()
+            if priority is None:
+                priority = REQUEST_PRIORITY_INTERACTIVE
+            return await self._send_request(url, priority, 1)
+
+        if priority is None:
+            priority = REQUEST_PRIORITY_POLL
+
+        if max_age is None:
+            max_age = self.cache_ttl
+        if (max_age > 0) and (cached := self._response_cache.get(url)):
+            timestamp, data = cached
+            if timestamp > time.time() - max_age:
+                self.cache_hits += 1
+                return data
+
+        # Only join a request that is scheduled at least as urgently, a
+        # command is not left waiting behind a background poll
+        inflight = self._inflight_requests.get(url)
+        if inflight is not None and inflight[1] <= priority:
+            self.coalesced_requests += 1
+            task = inflight[0]
+        else:
+            task = asyncio.ensure_future(
+                self._send_request(url, priority, REQUEST_RETRY_ATTEMPTS)
+            )
+            self._inflight_requests[url] = (task, priority)
+            generation = self._cache_generation
+            task.add_done_callback(lambda t: self._request_done(url, t, generation))
+        return await asyncio.shield(task)
+
+    def _invalidate_cache(self) -> None:
+        self._cache_generation += 1
+        self._response_cache.clear()
+        self._inflight_requests.clear()
+
+    def _request_done(self, url: str, task: asyncio.Task, generation: int) -> None:
+        inflight = self._inflight_requests.get(url)
+        if inflight is not None and inflight[0] is task:
+            del self._inflight_requests[url]
+        if task.cancelled() or task.exception() is not None:
+            return
+        if generation != self._cache_generation:
+            # Sent before a write, the response may be outdated already
+            return
+        if len(self._response_cache) >= REQUEST_CACHE_MAX_ENTRIES:
+            expired = time.time() - self.cache_ttl
+            for key in [
+                k for k, (t, _) in self._response_cache.items() if t <= expired
+            ]:
+                del self._response_cache[key]
+        if len(self._response_cache) < REQUEST_CACHE_MAX_ENTRIES:
+            self._response_cache[url] = (time.time(), task.result())
+
+    def get_request_statistics(self) -> dict:
+        return {
+            "inflight_requests": len(self._inflight_requests),
+            "coalesced_requests": self.coalesced_requests,
+            "cache_hits": self.cache_hits,
+            "cached_responses": len(self._response_cache),
+        }
+
+    async def _send_request(self, url: str, priority: int, attempts: int) -> dict:
+        # Only reads are retried, repeating a command could apply it twice
+        attempt = 1
+        while True:
+            self.breaker.before_request()
+            try:
+                data = await self._send_scheduled_request(url, priority)
+            except CannotConnect:
+                self.breaker.record_failure()
+                if attempt >= attempts or self.breaker.is_open():
+                    raise
+            except asyncio.CancelledError:
+                self.breaker.record_cancelled()
+                raise
+            except Exception:
+                # Any other error means the dSS did answer
+                self.breaker.record_success()
+                raise
+            else:
+                self.breaker.record_success()
+                return data
+            delay = min(
+                REQUEST_RETRY_MAX_DELAY, REQUEST_RETRY_BASE_DELAY * 2 ** (attempt - 1)
+            )
+            await asyncio.sleep(random.uniform(0, delay))
+            self.retried_requests += 1
+            attempt += 1
+
+    async def _send_scheduled_request(self, url: str, priority: int) -> dict:
+        # User commands are never throttled, they are rare and the user is
+        # waiting for them
+        if priority != REQUEST_PRIORITY_INTERACTIVE:
+            await self.rate_limiter.acquire()
+        async with self.scheduler.slot(priority):
+            start = time.monotonic()
+            try:
+                data = await self._send_authenticated_request(url)
+            except (CannotConnect, ServerBusy):
+                # Only overload slows down the requests, not requests the dSS
+                # rejected
+                self.rate_limiter.report_error()
+                raise
+            self.rate_limiter.report_success(time.monotonic() - start)
+            return data
 
+    async def _send_authenticated_request(self, url: str) -> dict:
+        token = await self.auth.get_token()
+        try:
+            data = await self._request_authenticated(url, token)
+        except InvalidAuth:
+            # The dSS may have dropped the session early (e.g. after a
+            # restart), log in once more before giving up
+            self.auth.invalidate(token)
+            token = await self.auth.get_token()
+            data = await self._request_authenticated(url, token)
+        self.auth.mark_used()
+        self.last_request = self.auth.last_used
+        return data
+
+    async def _request_authenticated(self, url: str, token: str) -> dict:
         # Use REST API for meterings endpoints
         if "apartment/meterings" in url:
             import logging
             logger = logging.getLogger(__name__)
             logger.debug("Using REST API for: %s", url)
             logger.debug("Full URL: https://%s:%s/api/v1/%s", self.host, self.port, url)
-            data = await self._request_rest_api(url)
+            data = await self._request_rest_api(url, token)
             logger.debug("REST API response received: %s", data)
             return data
 
         # Use traditional JSON API for other endpoints
-        if (self.last_request is None) or (
-            self.last_request < time.time() - SESSION_TOKEN_TIMEOUT
-        ):
-            self._session_token = await self.request_session_token()
-
-        data = await self._request_raw(url, dict(token=self._session_token))
-        self.last_request = time.time()
-
-        return data
+        return await self._request_raw(url, token)
 
     def register_event_callback(
         self, callback: Callable[[dict], Awaitable[None]]
@@ -213,60 +465,206 @@ class DigitalstromClient:
         if callback in self._event_callbacks:
             self._event_callbacks.remove(callback)
 
+    def register_connection_callback(
+        self, callback: Callable[[], Awaitable[None]]
+    ) -> None:
+        # Register a callback run after every websocket (re)connect, events
+        # sent by the dSS while the websocket was down are lost
+        self._connection_callbacks.append(callback)
+
+    def unregister_connection_callback(
+        self, callback: Callable[[], Awaitable[None]]
+    ) -> None:
+        if callback in self._connection_callbacks:
+            self._connection_callbacks.remove(callback)
+
+    async def _run_connection_callbacks(self) -> None:
+        for callback in list(self._connection_callbacks):
+            try:
+                await callback()
+            except Exception as e:
+                self.logger.debug("Connection callback failed: %s", e)
+
     async def start_event_listener(self) -> None:
-        # Start the event listener
+        # Connect to the websocket and process events until it is closed
         # Previous login via request_app_token or set_app_token is required
-        if type(self.ssl) is not bool and type(self.ssl) is not aiohttp.Fingerprint:
-            raise InvalidFingerprint()
-        if self._ws is not None:
-            await self.stop_event_listener()
-        self._ws = aiohttp.ClientSession(
-            connector=aiohttp.TCPConnector(family=socket.AF_INET, ssl=self.ssl),
-            cookies=dict(token=await self.request_session_token()),
-            loop=self._loop,
-        )
+        session = self._get_session()
+        await self._close_websocket()
         try:
-            async with self._ws.ws_connect(
-                url=f"wss://{self.host}:{self.port}/websocket"
+            async with session.ws_connect(
+                url=f"wss://{self.host}:{self.port}/websocket",
+                headers=self._token_headers(await self.auth.get_token()),
+                autoping=False,
             ) as ws:
-                async for msg in ws:
-                    try:
-                        if msg.type == aiohttp.WSMsgType.TEXT:
-                            self.last_event = time.time()
-                            event = json.loads(msg.data)
-                            if event.get("name"):
-                                for callback in self._event_callbacks:
-                                    await callback(event)
-                        elif msg.type == aiohttp.WSMsgType.CLOSED:
-                            break
-                        elif msg.type == aiohttp.WSMsgType.ERROR:
-                            break
-                    except Exception as e:
-                        pass
+                self._ws = ws
+                self.connected_since = time.time()
+                self.last_heartbeat = self.connected_since
+                self._start_event_dispatcher()
+                heartbeat = asyncio.ensure_future(self._send_heartbeats(ws))
+                if self._connection_callbacks:
+                    self._connection_task = asyncio.ensure_future(
+                        self._run_connection_callbacks()
+                    )
+                try:
+                    async for msg in ws:
+                        try:
+                            if msg.type == aiohttp.WSMsgType.TEXT:
+                                # Only queue the event here, a slow consumer
+                                # must not stop the socket from being read
+                                self.last_event = time.time()
+                                event = json.loads(msg.data)
+                                if event.get("name"):
+                                    self._event_queue.put_nowait(
+                                        event, self.last_event
+                                    )
+                            elif msg.type == aiohttp.WSMsgType.PING:
+                                await ws.pong(msg.data)
+                            elif msg.type == aiohttp.WSMsgType.PONG:
+                                self.last_heartbeat = time.time()
+                            elif msg.type == aiohttp.WSMsgType.CLOSED:
+                                break
+                            elif msg.type == aiohttp.WSMsgType.ERROR:
+                                break
+                        except Exception as e:
+                            pass
+                finally:
+                    heartbeat.cancel()
+                    self.connected_time += time.time() - self.connected_since
+                    self.connected_since = None
         except aiohttp.ClientError as e:
             raise CannotConnect(e) from None
 
-    async def stop_event_listener(self) -> None:
-        # Stop the event listener
+    async def _send_heartbeats(self, ws: aiohttp.ClientWebSocketResponse) -> None:
+        # Close the websocket if the dSS stops answering pings, the
+        # supervisor then reconnects right away
+        while not ws.closed:
+            await asyncio.sleep(WEBSOCKET_HEARTBEAT_INTERVAL)
+            sent = time.time()
+            try:
+                await ws.ping()
+            except (aiohttp.ClientError, ConnectionError, RuntimeError):
+                return
+            await asyncio.sleep(WEBSOCKET_HEARTBEAT_TIMEOUT)
+            if self.last_heartbeat < sent and (
+                self.last_event is None or self.last_event < sent
+            ):
+                self.logger.debug("Websocket heartbeat timed out, reconnecting")
+                self.heartbeat_timeouts += 1
+                await ws.close()
+                return
+
+    def start_event_supervisor(self) -> None:
+        # Keep the event listener connected in a background task
+        if self._event_supervisor is None or self._event_supervisor.done():
+            self._event_supervisor = asyncio.ensure_future(
+                self._supervise_event_listener()
+            )
+
+    async def _supervise_event_listener(self) -> None:
+        delay = WEBSOCKET_RECONNECT_MIN_DELAY
+        while True:
+            started = time.time()
+            if self.breaker.is_open():
+                # The dSS is known to be unreachable, wait for the probe
+                await asyncio.sleep(self.breaker.retry_in())
+            try:
+                await self.start_event_listener()
+                self.logger.debug("Event listener disconnected")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.debug("Event listener failed: %s", e)
+            if time.time() - started > WEBSOCKET_STABLE_CONNECTION:
+                delay = WEBSOCKET_RECONNECT_MIN_DELAY
+            await asyncio.sleep(random.uniform(delay / 2, delay))
+            delay = min(delay * 2, WEBSOCKET_RECONNECT_MAX_DELAY)
+            self.reconnects += 1
+
+    def get_event_listener_statistics(self) -> dict:
+        uptime = 0.0
+        if self.connected_since is not None:
+            uptime = time.time() - self.connected_since
+        return {
+            "connected": self.event_listener_connected(),
+            "connected_since": self.connected_since,
+            "uptime": uptime,
+            "total_uptime": self.connected_time + uptime,
+            "reconnects": self.reconnects,
+            "heartbeat_timeouts": self.heartbeat_timeouts,
+        }
+
+    def _start_event_dispatcher(self) -> None:
+        if self._event_dispatcher is None or self._event_dispatcher.done():
+            self._event_dispatcher = asyncio.ensure_future(self._dispatch_events())
+
+    async def _dispatch_events(self) -> None:
+        while True:
+            received, event = await self._event_queue.get()
+            self.event_lag.record(received)
+            for callback in list(self._event_callbacks):
+                try:
+                    await callback(event)
+                except Exception as e:
+                    self.logger.debug(
+                        "Event callback failed for %s: %s", event.get("name"), e
+                    )
+
+    def get_event_statistics(self) -> dict:
+        return {
+            "queue_depth": len(self._event_queue),
+            "queue_max_depth": self._event_queue.max_depth,
+            "queue_size": self._event_queue.maxsize,
+            "dropped_events": self._event_queue.dropped_events,
+        } | self.event_lag.get_statistics()
+
+    async def _close_websocket(self) -> None:
         if self._ws is not None:
             await self._ws.close()
             self._ws = None
 
+    async def stop_event_listener(self) -> None:
+        # Stop the event listener and release the connection pool
+        tasks = [
+            task
+            for task in [
+                self._event_supervisor,
+                self._event_dispatcher,
+                self._connection_task,
+            ]
+            if task is not None
+        ]
+        for task in tasks:
+            task.cancel()
+        self._event_supervisor = None
+        self._event_dispatcher = None
+        self._connection_task = None
+        await self._close_websocket()
+        # No task may send requests after the connection pool is closed
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._event_queue.clear()
+        await self.close()
+
+    async def close(self) -> None:
+        # Close the shared connection pool, it is recreated on the next request
+        self.auth.close()
+        self._invalidate_cache()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
     def event_listener_connected(self) -> bool:
-        # Check if the event listener is connected
+        # Check if the event listener is connected and the dSS is still
+        # sending events or answering heartbeats
+        last_activity = max(self.last_event or 0, self.last_heartbeat or 0)
         return (
             (self._ws is not None)
             and (not self._ws.closed)
-            and (
-                (self.last_event is None)
-                or (self.last_event > time.time() - EVENT_LISTENER_TIMEOUT)
-            )
+            and (last_activity > time.time() - EVENT_LISTENER_TIMEOUT)
         )
 
     async def event_listener_watchdog(self, time: Any) -> None:
-        # Restart the event listener if it's not running
-        if not self.event_listener_connected():
-            try:
-                await self.start_event_listener()
-            except CannotConnect:
-                pass
+        # Safety net in case the supervisor stopped or missed a dead connection
+        if self._event_supervisor is None or self._event_supervisor.done():
+            self.start_event_supervisor()
+        elif self._ws is not None and not self.event_listener_connected():
+            await self._close_websocket()
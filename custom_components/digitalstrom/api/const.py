@@ -2,6 +2,9 @@ SSL_FINGERPRINT_REGEX = r"[^0-9a-fA-F]|0[xX]"
 SESSION_TOKEN_TIMEOUT = 50
 EVENT_LISTENER_TIMEOUT = 120
 BUTTON_BUS_EVENT_TIMEOUT = 10
+# Stepping, stop and impulse scenes change the outputs relative to their
+# current values, the result of every other scene only depends on the device
+UNPREDICTABLE_SCENES = {10, 11, 12, 15, 41, *range(42, 50), *range(52, 56)}
 INVERTED_BINARY_INPUTS = {
     "EnOcean single contact (D5-00-01)": "always_invert",
     "IC Alarm 400 Modul": "always_invert",
@@ -21,3 +24,40 @@ SUPPORTED_OUTPUT_CHANNELS = [
     "shadeOpeningAngleIndoor",
     "powerLevel",
 ]
+CONNECTION_LIMIT = 4
+CONNECTION_KEEPALIVE_TIMEOUT = 30
+SESSION_TOKEN_RENEWAL_MARGIN = 5
+IDEMPOTENT_METHOD_PREFIXES = ("get", "query", "firmwareCheck")
+IDEMPOTENT_REST_PATHS = ("apartment/meterings",)
+REQUEST_CACHE_TTL = 2
+REQUEST_CACHE_MAX_ENTRIES = 512
+MAX_CONCURRENT_REQUESTS = 3
+REQUEST_PRIORITY_INTERACTIVE = 0
+REQUEST_PRIORITY_EVENT = 1
+REQUEST_PRIORITY_POLL = 2
+RATE_LIMIT_RATE = 10
+RATE_LIMIT_BURST = 20
+RATE_LIMIT_MIN_RATE = 1
+RATE_LIMIT_DECREASE_FACTOR = 0.5
+RATE_LIMIT_INCREASE_STEP = 0.5
+RATE_LIMIT_SLOW_RESPONSE = 2
+REQUEST_TIMEOUT = 30
+REQUEST_RETRY_ATTEMPTS = 3
+REQUEST_RETRY_BASE_DELAY = 0.5
+REQUEST_RETRY_MAX_DELAY = 5
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN = 30
+QUERY_FAILURE_THRESHOLD = 3
+QUERY_RETRY_INTERVAL = 600
+EVENT_QUEUE_SIZE = 1000
+EVENT_QUEUE_DROP_SUPERSEDED = "drop_superseded"
+EVENT_QUEUE_DROP_OLDEST = "drop_oldest"
+EVENT_QUEUE_DROP_NEWEST = "drop_newest"
+WEBSOCKET_HEARTBEAT_INTERVAL = 15
+WEBSOCKET_HEARTBEAT_TIMEOUT = 10
+WEBSOCKET_RECONNECT_MIN_DELAY = 1
+WEBSOCKET_RECONNECT_MAX_DELAY = 60
+WEBSOCKET_STABLE_CONNECTION = 60
+STRUCTURE_LOAD_CONCURRENCY = 8
+STRUCTURE_REFRESH_DELAY = 5
+SPLIT_DETECTION_INCREMENTAL_LIMIT = 16
@@ -1,4 +1,5 @@
 import re
+import sys
 from collections.abc import Callable
 from typing import Self
 
@@ -8,11 +9,48 @@ from .const import (
     INVERTED_BINARY_INPUTS,
     NOT_DIMMABLE_OUTPUT_MODES,
     SUPPORTED_OUTPUT_CHANNELS,
+    UNPREDICTABLE_SCENES,
 )
 from .exceptions import ServerError
 
 
 class DigitalstromDevice:
+    __slots__ = (
+        "client",
+        "apartment",
+        "dsuid",
+        "dsuid_int",
+        "dsid",
+        "name",
+        "hw_info",
+        "oem_product_url",
+        "manufacturer",
+        "zone_id",
+        "group_ids",
+        "button_used",
+        "button_group",
+        "output_dimmable",
+        "sensors",
+        "binary_inputs",
+        "output_channels",
+        "power_state",
+        "button",
+        "meter_dsuid",
+        "dsuid_index",
+        "oem_part_number",
+        "parent_device",
+        "available",
+        "availability_callbacks",
+        "reading_power_state_supported",
+        "unique_device_names",
+        "output_channel_log_count",
+        "scene_values",
+        "called_scene",
+        "undo_values",
+        "unverified_scene",
+        "unverified_values",
+    )
+
     def __init__(
         self, client: DigitalstromClient, apartment: DigitalstromApartment, dsuid: str
     ):
@@ -20,46 +58,69 @@ class DigitalstromDevice:
             DigitalstromBinaryInputChannel,
             DigitalstromButtonChannel,
             DigitalstromOutputChannel,
+            DigitalstromPowerStateChannel,
             DigitalstromSensorChannel,
         )
 
         self.client = client
         self.apartment = apartment
         self.dsuid = dsuid
+        self.dsuid_int = int(dsuid, 16)
         self.dsid = ""
         self.name = ""
         self.hw_info = ""
         self.oem_product_url = None
         self.manufacturer = "digitalSTROM"
         self.zone_id: int | None = None
+        self.group_ids: list[int] = []
         self.button_used: bool | None = None
         self.button_group = 0
         self.output_dimmable: bool | None = None
         self.sensors: dict[int, DigitalstromSensorChannel] = {}
         self.binary_inputs: dict[int, DigitalstromBinaryInputChannel] = {}
         self.output_channels: dict[int, DigitalstromOutputChannel] = {}
+        # Only devices with a powerLevel output channel have a power state
+        self.power_state: DigitalstromPowerStateChannel | None = None
         self.button: DigitalstromButtonChannel | None = None
         self.meter_dsuid: str | None = None
         self.dsuid_index = None
         self.oem_part_number = None
         self.parent_device: Self | None = None
         self.available = False
-        self.availability_callbacks: list[Callable] = []
+        self.availability_callbacks: list[Callable] | tuple = ()
         self.reading_power_state_supported: bool | None = None
         self.unique_device_names: list[str] = []
         self.output_channel_log_count = 0
+        # Output values per scene and channel index, learned from the reads
+        # after scene calls
+        self.scene_values: dict[int, dict[int, float]] | None = None
+        self.called_scene: int | None = None
+        self.undo_values: dict[int, float | None] | None = None
+        self.unverified_scene: int | None = None
+        # Values of the last read since the unverified scene was called
+        self.unverified_values: dict[int, float] | None = None
 
     def get_parent(self) -> Self:
-        if self.parent_device is not None and self.parent_device != self:
-            return self.parent_device.get_parent()
-        return self
+        root = self
+        while root.parent_device is not None and root.parent_device is not root:
+            root = root.parent_device
+        # Path compression, following lookups take a single step
+        device = self
+        while device is not root:
+            device.parent_device, device = root, device.parent_device
+        return root
 
     def update_availability(self, available: bool) -> None:
         parent = self.get_parent()
         if parent != self:
             parent.update_availability(available)
             return
-        if not self.available == available:
+        self._set_available(available)
+
+    def _set_available(self, available: bool) -> None:
+        # Availability as reported for this device itself, entities of split
+        # devices follow the parent via update_availability
+        if self.available != available:
             self.available = available
             for callback in self.availability_callbacks:
                 callback(available)
@@ -67,6 +128,8 @@ class DigitalstromDevice:
     def register_availability_callback(
         self, callback: Callable[[bool], None]
     ) -> Callable[[], None]:
+        if not self.availability_callbacks:
+            self.availability_callbacks = []
         if callback not in self.availability_callbacks:
             self.availability_callbacks.append(callback)
 
@@ -84,6 +147,19 @@ class DigitalstromDevice:
             self._load_binary_inputs(data)
             self._load_outputs(data)
 
+    def get_structure_signature(self) -> tuple:
+        # Changes of these attributes require updating entities or devices
+        return (
+            self.name,
+            self.zone_id,
+            self.meter_dsuid,
+            self.button is not None,
+            tuple(self.sensors.keys()),
+            tuple(self.binary_inputs.keys()),
+            tuple(self.output_channels.keys()),
+            None if self.parent_device is None else self.parent_device.dsuid,
+        )
+
     def output_channels_clear_prepared_values(self) -> None:
         for index in self.output_channels.keys():
             self.output_channels[index].prepared_value = None
@@ -101,7 +177,10 @@ class DigitalstromDevice:
         )
 
     async def output_channels_get_values(
-        self, channels: list[str] | None = None
+        self,
+        channels: list[str] | None = None,
+        priority: int | None = None,
+        max_age: float | None = None,
     ) -> None:
         channel_values = []
         if channels is None:
@@ -112,9 +191,12 @@ class DigitalstromDevice:
         channel_values_str = ";".join(channel_values)
         result_channel_values = {}
 
-        result = await self.client.request(
-            f"device/getOutputChannelValue?dsuid={self.dsuid}&channels={channel_values_str}"
-        )
+        async with self.client.bus_scheduler.slot(self.meter_dsuid, priority):
+            result = await self.client.request(
+                f"device/getOutputChannelValue?dsuid={self.dsuid}&channels={channel_values_str}",
+                max_age=max_age,
+                priority=priority,
+            )
         if self.output_channel_log_count < 100:
             self.output_channel_log_count += 1
             self.apartment.logger.debug(
@@ -129,17 +211,100 @@ class DigitalstromDevice:
 
         for output_channel in self.output_channels.values():
             if output_channel.channel_type in channels:
-                output_channel.last_value = result_channel_values.get(
-                    output_channel.channel_type, None
-                )
-
-    async def get_power_state(self) -> float | None:
+                value = result_channel_values.get(output_channel.channel_type, None)
+                if output_channel.last_value != value:
+                    output_channel.update(value)
+
+    def apply_scene(self, scene: int) -> None:
+        # Predict the outputs of a scene call from its known values, the reads
+        # of the outputs that follow verify them with learn_scene_values()
+        # Outputs may start fading again, earlier reads don't count
+        self.unverified_values = None
+        if scene in UNPREDICTABLE_SCENES:
+            self.unverified_scene = None
+            return
+        if self.called_scene != scene:
+            # Calling the same scene again keeps the values undo returns to
+            self.undo_values = {
+                index: channel.last_value
+                for index, channel in self.output_channels.items()
+            }
+            self.called_scene = scene
+        self.unverified_scene = scene
+        if self.scene_values is not None and (values := self.scene_values.get(scene)):
+            self._apply_output_values(values)
+
+    def apply_undo_scene(self, scene: int) -> None:
+        self.unverified_scene = None
+        self.unverified_values = None
+        if self.called_scene == scene and self.undo_values is not None:
+            self._apply_output_values(self.undo_values)
+        self.called_scene = None
+        self.undo_values = None
+
+    def _apply_output_values(self, values: dict[int, float | None]) -> None:
+        for index, value in values.items():
+            if (
+                value is not None
+                and (output_channel := self.output_channels.get(index)) is not None
+                and output_channel.last_value != value
+            ):
+                output_channel.update(value)
+
+    def learn_scene_values(self, scene: int, channels: list) -> bool:
+        # Remember the values read after a call of the scene as its values,
+        # returns whether they differ from the known ones. Nothing is learned
+        # if another scene was called since the read was started. A value is
+        # only learned once two reads agree, a read may catch an output while
+        # it is still fading or moving. The scene stays unverified until all
+        # channels read have settled.
+        if self.unverified_scene != scene:
+            return False
+        read = {
+            output_channel.index: output_channel.last_value
+            for output_channel in channels
+            if output_channel.last_value is not None
+        }
+        previous = self.unverified_values or {}
+        settled = {
+            index: value
+            for index, value in read.items()
+            if previous.get(index) == value
+        }
+        self.unverified_values = previous | read
+        if len(settled) == 0:
+            return False
+        if len(settled) == len(read):
+            self.unverified_scene = None
+            self.unverified_values = None
+        if self.scene_values is None:
+            self.scene_values = {}
+        values = self.scene_values.setdefault(scene, {})
+        changed = False
+        for index, value in settled.items():
+            if values.get(index) != value:
+                values[index] = value
+                changed = True
+        return changed
+
+    def load_scene_values(self, data: dict) -> None:
+        self.scene_values = {
+            int(scene): {int(index): float(value) for index, value in values.items()}
+            for scene, values in data.items()
+        }
+
+    async def get_power_state(
+        self, priority: int | None = None, max_age: float | None = None
+    ) -> float | None:
         if self.reading_power_state_supported == False:
             return None
         try:
-            result = await self.client.request(
-                f"property/getFloating?path=/apartment/zones/zone{self.zone_id}/devices/{self.dsuid}/status/outputs/powerState/targetValue"
-            )
+            async with self.client.bus_scheduler.slot(self.meter_dsuid, priority):
+                result = await self.client.request(
+                    f"property/getFloating?path=/apartment/zones/zone{self.zone_id}/devices/{self.dsuid}/status/outputs/powerState/targetValue",
+                    max_age=max_age,
+                    priority=priority,
+                )
             self.reading_power_state_supported = True
             return result.get("value", None)
         except ServerError:
@@ -167,7 +332,7 @@ class DigitalstromDevice:
             if len(self.unique_device_names) == 0:
                 self.unique_device_names.append(self.name)
         if (hw_info := data.get("hwInfo")) and (len(hw_info) > 0):
-            self.hw_info = hw_info
+            self.hw_info = sys.intern(hw_info)
 
         if (oem_product_url := data.get("OemProductURL")) and (
             len(oem_product_url)
@@ -188,8 +353,11 @@ class DigitalstromDevice:
         if zone_id := data.get("zoneID"):
             self.zone_id = int(zone_id)
 
+        if (group_ids := data.get("groups")) is not None:
+            self.group_ids = [int(g) for g in group_ids]
+
         if meter_dsuid := data.get("meterDSUID"):
-            self.meter_dsuid = meter_dsuid
+            self.meter_dsuid = sys.intern(meter_dsuid)
 
         if "dSUIDIndex" in data.keys():
             self.dsuid_index = data["dSUIDIndex"]
@@ -198,7 +366,7 @@ class DigitalstromDevice:
             self.oem_part_number = data["OemPartNumber"]
 
         if "isPresent" in data.keys():
-            self.available = data["isPresent"]
+            self._set_available(data["isPresent"])
 
     def _load_button(self, data: dict) -> None:
         if button_usage := data.get("buttonUsage"):
@@ -206,12 +374,13 @@ class DigitalstromDevice:
 
             if button_usage == "used":
                 self.button_used = True
-                self.button = DigitalstromButtonChannel(self)
             elif button_usage in ["auto_unused", "manual_unused"]:
                 self.button_used = False
-                self.button = DigitalstromButtonChannel(self)
             else:
                 self.button_used = None
+            # Keep the existing channel, entities are registered on it
+            if self.button_used is not None and self.button is None:
+                self.button = DigitalstromButtonChannel(self)
         if button_group := data.get("buttonGroupMembership"):
             self.button_group = int(button_group)
 
@@ -225,7 +394,9 @@ class DigitalstromDevice:
                 if not valid:
                     value = None
                 if sensor := self.sensors.get(index):
-                    sensor.update(value, valid)
+                    if sensor.last_value != value or sensor.valid != valid:
+                        sensor.valid = valid
+                        sensor.update(value, valid)
                 else:
                     from .channel import DigitalstromSensorChannel
 
@@ -247,9 +418,10 @@ class DigitalstromDevice:
                 input_type = input_dict.get("inputType")
                 input_id = input_dict.get("inputId")
                 raw_state = input_dict.get("state")
-                state = raw_state == 1
+                state = None if raw_state is None else raw_state == 1
                 if binary_input := self.binary_inputs.get(index):
-                    binary_input.update(state, raw_state)
+                    if binary_input.last_value != state:
+                        binary_input.update(state, raw_state)
                 else:
                     from .channel import DigitalstromBinaryInputChannel
 
@@ -275,3 +447,7 @@ class DigitalstromDevice:
                         self.output_channels[index] = DigitalstromOutputChannel(
                             self, index, channel_id, channel_name, channel_type
                         )
+                        if channel_type == "powerLevel" and self.power_state is None:
+                            from .channel import DigitalstromPowerStateChannel
+
+                            self.power_state = DigitalstromPowerStateChannel(self)
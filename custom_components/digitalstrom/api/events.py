@@ -0,0 +1,151 @@
+import asyncio
+import time
+from collections import deque
+
+from .const import (
+    EVENT_QUEUE_DROP_NEWEST,
+    EVENT_QUEUE_DROP_OLDEST,
+    EVENT_QUEUE_DROP_SUPERSEDED,
+)
+
+
+def superseding_key(event: dict) -> tuple | None:
+    # Events with the same key carry a complete state, so only the newest one
+    # of them is needed if the consumer falls behind
+    if event.get("name") == "deviceSensorValue":
+        try:
+            return (
+                "deviceSensorValue",
+                event["source"]["dsid"],
+                event["properties"]["sensorIndex"],
+            )
+        except (KeyError, TypeError):
+            return None
+    return None
+
+
+class _QueuedEvent:
+    # Entries are removed by identity, two identical events are still two
+    # entries
+    __slots__ = ("received", "event", "key", "dropped")
+
+    def __init__(self, received: float, event: dict, key: tuple | None):
+        self.received = received
+        self.event = event
+        self.key = key
+        self.dropped = False
+
+
+class DigitalstromEventQueue:
+    # Bounded queue between the websocket reader and the event dispatcher
+    # Dropped entries are only marked and skipped when they are reached, the
+    # deque is compacted once they make up half of it
+    def __init__(self, maxsize: int, overflow_policy: str = EVENT_QUEUE_DROP_SUPERSEDED):
+        self.maxsize = max(1, maxsize)
+        self.overflow_policy = overflow_policy
+        self.dropped_events = 0
+        self.max_depth = 0
+        self._entries: deque[_QueuedEvent] = deque()
+        self._size = 0
+        self._newest: dict[tuple, _QueuedEvent] = {}
+        self._not_empty = asyncio.Event()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put_nowait(self, event: dict, received: float) -> None:
+        entry = _QueuedEvent(received, event, superseding_key(event))
+        if self._size >= self.maxsize and not self._make_room(entry):
+            self.dropped_events += 1
+            return
+        self._entries.append(entry)
+        self._size += 1
+        if entry.key is not None:
+            self._newest[entry.key] = entry
+        self.max_depth = max(self.max_depth, self._size)
+        self._not_empty.set()
+
+    def _make_room(self, entry: _QueuedEvent) -> bool:
+        # Returns False if the new entry should be discarded instead
+        if self.overflow_policy == EVENT_QUEUE_DROP_NEWEST:
+            return False
+        if self.overflow_policy == EVENT_QUEUE_DROP_SUPERSEDED:
+            victim = None
+            if entry.key is not None:
+                victim = self._newest.get(entry.key)
+            if victim is None:
+                victim = next(
+                    (
+                        e
+                        for e in self._entries
+                        if not e.dropped
+                        and e.key is not None
+                        and self._newest.get(e.key) is not e
+                    ),
+                    None,
+                )
+            if victim is not None:
+                self._remove(victim)
+                self.dropped_events += 1
+                return True
+        if self.overflow_policy not in [
+            EVENT_QUEUE_DROP_OLDEST,
+            EVENT_QUEUE_DROP_SUPERSEDED,
+        ]:
+            return False
+        self._remove(self._first())
+        self.dropped_events += 1
+        return True
+
+    def _first(self) -> _QueuedEvent:
+        while self._entries[0].dropped:
+            self._entries.popleft()
+        return self._entries[0]
+
+    def _remove(self, entry: _QueuedEvent) -> None:
+        entry.dropped = True
+        self._size -= 1
+        if entry.key is not None and self._newest.get(entry.key) is entry:
+            del self._newest[entry.key]
+        if len(self._entries) > 2 * max(self._size, self.maxsize):
+            self._entries = deque(e for e in self._entries if not e.dropped)
+
+    async def get(self) -> tuple[float, dict]:
+        while self._size == 0:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        entry = self._first()
+        self._entries.popleft()
+        self._size -= 1
+        if entry.key is not None and self._newest.get(entry.key) is entry:
+            del self._newest[entry.key]
+        return entry.received, entry.event
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._size = 0
+        self._newest.clear()
+
+
+class DigitalstromEventLag:
+    # Time between receiving an event on the websocket and its dispatch
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: float | None = None
+
+    def record(self, received: float) -> None:
+        lag = time.time() - received
+        self.count += 1
+        self.total += lag
+        self.max = max(self.max, lag)
+        self.last = lag
+
+    def get_statistics(self) -> dict:
+        return {
+            "events": self.count,
+            "lag_last": self.last,
+            "lag_avg": (self.total / self.count) if self.count > 0 else None,
+            "lag_max": self.max,
+        }
@@ -21,3 +21,7 @@ class InvalidFingerprint(HomeAssistantError):
 
 class ServerError(HomeAssistantError):
     """Error to indicate the server returned unexpected data."""
+
+
+class ServerBusy(ServerError):
+    """Error to indicate the server is overloaded or unavailable."""
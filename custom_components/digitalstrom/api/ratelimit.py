@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+from .const import (
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_DECREASE_FACTOR,
+    RATE_LIMIT_INCREASE_STEP,
+    RATE_LIMIT_MIN_RATE,
+    RATE_LIMIT_SLOW_RESPONSE,
+)
+
+
+class DigitalstromRateLimiter:
+    # Token bucket limiting the request rate to the dSS
+    # Up to `burst` requests pass immediately, after that requests are spread
+    # out at `rate` requests per second. The effective rate is reduced when
+    # the dSS is overloaded (5xx status, timeouts, dropped connections) or
+    # answers slowly and recovers step by step while responses are healthy
+    # again. Requests the dSS rejected do not count as overload.
+    def __init__(self, rate: float, burst: int = RATE_LIMIT_BURST):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.throttled_requests = 0
+        self.throttled_time = 0.0
+        self.rate_decreases = 0
+        self._last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.burst), self.tokens + (now - self._last_refill) * self.rate
+        )
+        self._last_refill = now
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        self._refill()
+        if self.tokens >= 1 and not self._lock.locked():
+            self.tokens -= 1
+            return
+        # Wait in arrival order until a token is available
+        async with self._lock:
+            self._refill()
+            if self.tokens < 1:
+                self.throttled_requests += 1
+                delay = (1 - self.tokens) / self.rate
+                self.throttled_time += delay
+                await asyncio.sleep(delay)
+                self._refill()
+            self.tokens -= 1
+
+    def report_success(self, duration: float) -> None:
+        if duration > RATE_LIMIT_SLOW_RESPONSE:
+            self._decrease()
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + RATE_LIMIT_INCREASE_STEP)
+
+    def report_error(self) -> None:
+        self._decrease()
+
+    def _decrease(self) -> None:
+        self._refill()
+        new_rate = max(RATE_LIMIT_MIN_RATE, self.rate * RATE_LIMIT_DECREASE_FACTOR)
+        if new_rate < self.rate:
+            self.rate = new_rate
+            self.rate_decreases += 1
+
+    def get_statistics(self) -> dict:
+        return {
+            "rate": self.rate,
+            "max_rate": self.max_rate,
+            "burst": self.burst,
+            "available_tokens": self.tokens,
+            "throttled_requests": self.throttled_requests,
+            "throttled_time": self.throttled_time,
+            "rate_decreases": self.rate_decreases,
+        }
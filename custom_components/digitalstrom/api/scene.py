@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from datetime import datetime
 
 from .apartment import DigitalstromApartment
@@ -6,6 +7,8 @@ from .zone import DigitalstromZone
 
 
 class DigitalstromScene:
+    __slots__ = ()
+
     def __init__(self) -> None:
         pass
 
@@ -36,6 +39,30 @@ class DigitalstromApartmentScene(DigitalstromScene):
         self.last_update_timestamp = datetime.now()
         self.last_change_timestamp = datetime.now()
         self.force_update = True
+        self.update_callbacks: list[Callable] = []
+
+    def register_update_callback(self, callback: Callable) -> Callable[[], None]:
+        if callback not in self.update_callbacks:
+            self.update_callbacks.append(callback)
+
+        def unregister_update_callback() -> None:
+            if callback in self.update_callbacks:
+                self.update_callbacks.remove(callback)
+
+        return unregister_update_callback
+
+    def update(self, value: bool | None) -> None:
+        timestamp = datetime.now()
+        if value != self.last_value:
+            self.last_value = value
+            self.last_change_timestamp = timestamp
+            for callback in self.update_callbacks:
+                callback(value)
+        self.last_update_timestamp = timestamp
+
+    def update_from_state(self, state: str | None) -> None:
+        self.force_update = False
+        self.update(None if state is None else state == self.on_state)
 
     async def call(self, force: bool = False) -> None:
         await self.apartment.call_scene(self.call_number, force)
@@ -49,28 +76,24 @@ class DigitalstromApartmentScene(DigitalstromScene):
         self.force_update = True
 
     async def get_value(self) -> bool | None:
+        # Read only this state, DigitalstromApartment.update_scene_states reads
+        # all of them at once
         self.force_update = False
         if self.state_name is None or self.on_state is None:
             return None
-        timestamp = datetime.now()
-        value = None
         try:
             result = await self.apartment.client.request(
                 f"property/getString?path=/usr/states/{self.state_name}/state"
             )
-            value = result.get("value", None)
-            if value is not None:
-                value = value == self.on_state
+            self.update_from_state(result.get("value", None))
         except ServerError:
-            value = None
-        if value != self.last_value:
-            self.last_value = value
-            self.last_change_timestamp = timestamp
-        self.last_update_timestamp = timestamp
+            self.update(None)
         return self.last_value
 
 
 class DigitalstromZoneScene(DigitalstromScene):
+    __slots__ = ("zone", "name", "number", "group")
+
     def __init__(
         self,
         zone: DigitalstromZone,
@@ -85,6 +108,10 @@ class DigitalstromZoneScene(DigitalstromScene):
 
     async def call(self, force: bool = False) -> None:
         await self.zone.call_scene(self.number, self.group, force)
+        self.zone.apartment.apply_scene(self.zone.zone_id, self.group, self.number)
 
     async def undo(self) -> None:
         await self.zone.undo_scene(self.number, self.group)
+        self.zone.apartment.apply_scene(
+            self.zone.zone_id, self.group, self.number, undo=True
+        )
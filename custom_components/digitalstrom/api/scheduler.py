@@ -0,0 +1,170 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+from .const import (
+    REQUEST_PRIORITY_EVENT,
+    REQUEST_PRIORITY_INTERACTIVE,
+    REQUEST_PRIORITY_POLL,
+)
+
+REQUEST_PRIORITY_NAMES: dict[int, str] = {
+    REQUEST_PRIORITY_INTERACTIVE: "interactive",
+    REQUEST_PRIORITY_EVENT: "event",
+    REQUEST_PRIORITY_POLL: "poll",
+}
+
+
+class DigitalstromRequestScheduler:
+    # Limits the number of concurrent requests to the dSS and hands free
+    # slots to waiting requests by priority (lower value first), so user
+    # commands don't queue behind a burst of background polls
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._queued: dict[int, int] = {p: 0 for p in REQUEST_PRIORITY_NAMES}
+        self._wait_count: dict[int, int] = {p: 0 for p in REQUEST_PRIORITY_NAMES}
+        self._wait_total: dict[int, float] = {p: 0.0 for p in REQUEST_PRIORITY_NAMES}
+        self._wait_max: dict[int, float] = {p: 0.0 for p in REQUEST_PRIORITY_NAMES}
+
+    @asynccontextmanager
+    async def slot(self, priority: int) -> AsyncIterator[None]:
+        await self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: int) -> None:
+        start = time.monotonic()
+        if self.active < self.max_concurrency and not self._waiters:
+            self.active += 1
+        else:
+            future = asyncio.get_running_loop().create_future()
+            heapq.heappush(self._waiters, (priority, next(self._counter), future))
+            self._queued[priority] = self._queued.get(priority, 0) + 1
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was handed over just before the cancellation
+                    self.release()
+                else:
+                    future.cancel()
+                raise
+            finally:
+                self._queued[priority] -= 1
+        self._record_wait(priority, time.monotonic() - start)
+
+    def release(self) -> None:
+        # Hand the slot directly to the highest priority waiter
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+    def _record_wait(self, priority: int, wait: float) -> None:
+        self._wait_count[priority] = self._wait_count.get(priority, 0) + 1
+        self._wait_total[priority] = self._wait_total.get(priority, 0.0) + wait
+        self._wait_max[priority] = max(self._wait_max.get(priority, 0.0), wait)
+
+    def queue_depth(self, priority: int | None = None) -> int:
+        if priority is None:
+            return sum(self._queued.values())
+        return self._queued.get(priority, 0)
+
+    def get_statistics(self) -> dict:
+        lanes = {}
+        for priority, name in REQUEST_PRIORITY_NAMES.items():
+            count = self._wait_count[priority]
+            lanes[name] = {
+                "queue_depth": self._queued[priority],
+                "requests": count,
+                "wait_time_avg": (self._wait_total[priority] / count)
+                if count > 0
+                else None,
+                "wait_time_max": self._wait_max[priority],
+            }
+        return {
+            "max_concurrency": self.max_concurrency,
+            "active_requests": self.active,
+            "lanes": lanes,
+        }
+
+
+class DigitalstromBusScheduler:
+    # Reads like getOutputChannelValue are answered by the devices over the
+    # powerline bus of their dSM, so the dSS handles them one after another
+    # per circuit. Reads are serialized per meter dSUID here, different
+    # circuits don't wait for each other and no circuit can take all the
+    # request slots of DigitalstromRequestScheduler. Waiting reads of a
+    # circuit are let through by priority like the requests, a read after an
+    # event doesn't wait behind all background polls of its circuit.
+    def __init__(self) -> None:
+        self._schedulers: dict[str | None, DigitalstromRequestScheduler] = {}
+        self._backlog: dict[str | None, int] = {}
+        self._requests: dict[str | None, int] = {}
+        self._latency_total: dict[str | None, float] = {}
+        self._latency_max: dict[str | None, float] = {}
+        self._wait_total: dict[str | None, float] = {}
+
+    @asynccontextmanager
+    async def slot(
+        self, meter_dsuid: str | None, priority: int | None = None
+    ) -> AsyncIterator[None]:
+        if priority is None:
+            priority = REQUEST_PRIORITY_POLL
+        if (scheduler := self._schedulers.get(meter_dsuid)) is None:
+            scheduler = DigitalstromRequestScheduler(1)
+            self._schedulers[meter_dsuid] = scheduler
+            self._backlog[meter_dsuid] = 0
+            self._requests[meter_dsuid] = 0
+            self._latency_total[meter_dsuid] = 0.0
+            self._latency_max[meter_dsuid] = 0.0
+            self._wait_total[meter_dsuid] = 0.0
+        start = time.monotonic()
+        self._backlog[meter_dsuid] += 1
+        try:
+            await scheduler.acquire(priority)
+        finally:
+            self._backlog[meter_dsuid] -= 1
+        acquired = time.monotonic()
+        try:
+            yield
+        finally:
+            scheduler.release()
+            latency = time.monotonic() - acquired
+            self._requests[meter_dsuid] += 1
+            self._latency_total[meter_dsuid] += latency
+            self._latency_max[meter_dsuid] = max(
+                self._latency_max[meter_dsuid], latency
+            )
+            self._wait_total[meter_dsuid] += acquired - start
+
+    def backlog(self, meter_dsuid: str | None = None) -> int:
+        if meter_dsuid is None:
+            return sum(self._backlog.values())
+        return self._backlog.get(meter_dsuid, 0)
+
+    def get_statistics(self) -> dict:
+        circuits = {}
+        for meter_dsuid, count in self._requests.items():
+            circuits[meter_dsuid] = {
+                "backlog": self._backlog[meter_dsuid],
+                "requests": count,
+                "latency_avg": (self._latency_total[meter_dsuid] / count)
+                if count > 0
+                else None,
+                "latency_max": self._latency_max[meter_dsuid],
+                "wait_time_avg": (self._wait_total[meter_dsuid] / count)
+                if count > 0
+                else None,
+            }
+        return {"circuits": circuits}
@@ -14,6 +14,7 @@ class DigitalstromZone:
         self.name = ""
         self.group_ids: list[int] = []
         self.scenes: dict[str, DigitalstromZoneScene] = {}
+        self.scene_data: dict[int, dict] = {}
         self.climate_control_mode: int | None = None
         self.climate_control_state: int | None = None
         self.climate_operation_mode: int | None = None
@@ -53,6 +54,12 @@ class DigitalstromZone:
                     self.name = name
                 if (group_ids := data.get("groups")) and (len(group_ids) > 0):
                     self.group_ids = group_ids
+                    # Forget the scenes of groups that were removed
+                    for group_id in [g for g in self.scene_data if g not in group_ids]:
+                        del self.scene_data[group_id]
+                    for identifier, scene in list(self.scenes.items()):
+                        if scene.group not in group_ids:
+                            del self.scenes[identifier]
 
     def load_climate_data_from_dict(self, data: dict) -> None:
         if "id" in data:
@@ -74,24 +81,38 @@ class DigitalstromZone:
                     self.control_value = float(control_value)
 
     async def get_scenes(self) -> None:
-        from .scene import DigitalstromZoneScene
-
         for group_id in self.group_ids:
-            result = await self.client.request(
-                f"zone/getReachableScenes?id={self.zone_id}&groupID={group_id}"
+            self.load_scenes_from_dict(
+                group_id, await self.get_reachable_scenes(group_id)
             )
-            reachable_scenes = result.get("reachableScenes", [])
-            named_scenes = result.get("userSceneNames", [])
-            for scene in named_scenes:
-                if number := scene.get("sceneNr"):
-                    identifier = f"{group_id}_{int(number)}"
-                    if identifier not in self.scenes.keys():
-                        self.scenes[identifier] = DigitalstromZoneScene(
-                            self, int(number), group_id, scene.get("sceneName", None)
-                        )
-            for number in reachable_scenes:
+
+    async def get_reachable_scenes(self, group_id: int) -> dict:
+        return await self.client.request(
+            f"zone/getReachableScenes?id={self.zone_id}&groupID={group_id}"
+        )
+
+    def load_scenes_from_dict(self, group_id: int, data: dict) -> None:
+        from .scene import DigitalstromZoneScene
+
+        reachable_scenes = data.get("reachableScenes", [])
+        named_scenes = data.get("userSceneNames", [])
+        present = set()
+        for scene in named_scenes:
+            if number := scene.get("sceneNr"):
                 identifier = f"{group_id}_{int(number)}"
+                present.add(identifier)
                 if identifier not in self.scenes.keys():
                     self.scenes[identifier] = DigitalstromZoneScene(
-                        self, int(number), group_id, None
+                        self, int(number), group_id, scene.get("sceneName", None)
                     )
+        for number in reachable_scenes:
+            identifier = f"{group_id}_{int(number)}"
+            present.add(identifier)
+            if identifier not in self.scenes.keys():
+                self.scenes[identifier] = DigitalstromZoneScene(
+                    self, int(number), group_id, None
+                )
+        for identifier, scene in list(self.scenes.items()):
+            if scene.group == group_id and identifier not in present:
+                del self.scenes[identifier]
+        self.scene_data[group_id] = data
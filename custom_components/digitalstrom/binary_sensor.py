@@ -8,12 +8,12 @@ from homeassistant.components.binary_sensor import (
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.channel import DigitalstromBinaryInputChannel
 from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .entity import DigitalstromEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -179,12 +179,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up the binary sensor platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    binary_sensors = []
-    for device in apartment.devices.values():
-        for binary_sensor in device.binary_inputs.values():
-            binary_sensors.append(DigitalstromBinarySensor(binary_sensor))
-    _LOGGER.debug("Adding %i binary sensors", len(binary_sensors))
-    async_add_entities(binary_sensors)
+
+    @callback
+    def create_binary_sensors() -> list[DigitalstromBinarySensor]:
+        binary_sensors = []
+        for device in apartment.devices.values():
+            for binary_sensor in device.binary_inputs.values():
+                binary_sensors.append(DigitalstromBinarySensor(binary_sensor))
+        _LOGGER.debug("Found %i binary sensors", len(binary_sensors))
+        return binary_sensors
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_binary_sensors
+    )
 
 
 class DigitalstromBinarySensor(BinarySensorEntity, DigitalstromEntity):
@@ -236,7 +243,8 @@ class DigitalstromBinarySensor(BinarySensorEntity, DigitalstromEntity):
             return
         if state is None:
             self._state = None
-        self._state = state != self.channel.inverted
+        else:
+            self._state = state != self.channel.inverted
         self.async_write_ha_state()
 
     async def async_will_remove_from_hass(self) -> None:
@@ -29,6 +29,7 @@ from .api.apartment import DigitalstromApartment
 from .api.exceptions import InvalidAuth
 from .api.zone import DigitalstromZone
 from .const import DOMAIN
+from .entity import async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -77,16 +78,26 @@ async def async_setup_entry(
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
     coordinator = DigitalstromClimateCoordinator(hass, apartment)
     await coordinator.async_config_entry_first_refresh()
-    climate_entities = []
-    for zone in apartment.zones.values():
-        if zone.climate_control_mode == 1:
-            climate_entities.append(DigitalstromClimateEntity(coordinator, zone))
-        elif zone.climate_control_mode != 0 and zone.climate_control_mode is not None:
-            _LOGGER.debug(
-                f"Zone '{zone.name}' has temperature control mode {zone.climate_control_mode}. Only PID mode (1) is supported."
-            )
-    _LOGGER.debug("Adding %i climate entities", len(climate_entities))
-    async_add_entities(climate_entities)
+
+    @callback
+    def create_climate_entities() -> list[DigitalstromClimateEntity]:
+        climate_entities = []
+        for zone in apartment.zones.values():
+            if zone.climate_control_mode == 1:
+                climate_entities.append(DigitalstromClimateEntity(coordinator, zone))
+            elif (
+                zone.climate_control_mode != 0
+                and zone.climate_control_mode is not None
+            ):
+                _LOGGER.debug(
+                    f"Zone '{zone.name}' has temperature control mode {zone.climate_control_mode}. Only PID mode (1) is supported."
+                )
+        _LOGGER.debug("Found %i climate entities", len(climate_entities))
+        return climate_entities
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_climate_entities
+    )
 
 
 class DigitalstromClimateCoordinator(DataUpdateCoordinator):
@@ -116,6 +127,7 @@ class DigitalstromClimateEntity(CoordinatorEntity, ClimateEntity):
     ):
         super().__init__(coordinator)
         self.zone = zone
+        self.structure_signature = (zone,)
         self._attr_has_entity_name = True
         self._attr_translation_key = "zone_climate"
         self._attr_unique_id: str = (
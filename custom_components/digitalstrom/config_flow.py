@@ -10,7 +10,12 @@ from urllib.parse import urlparse
 
 import voluptuous as vol
 from homeassistant.components import ssdp, zeroconf
-from homeassistant.config_entries import ConfigEntry, ConfigFlow, ConfigFlowResult
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
 from homeassistant.const import (
     CONF_HOST,
     CONF_PASSWORD,
@@ -18,9 +23,14 @@ from homeassistant.const import (
     CONF_TOKEN,
     CONF_USERNAME,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 
 from .api.client import DigitalstromClient
+from .api.const import (
+    EVENT_QUEUE_DROP_NEWEST,
+    EVENT_QUEUE_DROP_OLDEST,
+    EVENT_QUEUE_DROP_SUPERSEDED,
+)
 from .api.exceptions import (
     CannotConnect,
     InvalidAuth,
@@ -29,13 +39,24 @@ from .api.exceptions import (
 )
 from .const import (
     CONF_DSUID,
+    CONF_EVENT_OVERFLOW_POLICY,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MAX_REQUESTS_PER_SECOND,
+    CONF_REQUEST_BURST,
     CONF_SSL,
+    CONF_STRUCTURE_LOAD_CONCURRENCY,
+    DEFAULT_EVENT_OVERFLOW_POLICY,
     DEFAULT_HOST,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MAX_REQUESTS_PER_SECOND,
     DEFAULT_PORT,
+    DEFAULT_REQUEST_BURST,
+    DEFAULT_STRUCTURE_LOAD_CONCURRENCY,
     DEFAULT_USERNAME,
     DOMAIN,
     IGNORE_SSL_VERIFICATION,
 )
+from .coordinator import POLL_INTERVAL_OPTIONS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,6 +78,18 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
         host=data[CONF_HOST], port=data[CONF_PORT], ssl=ssl, loop=hass.loop
     )
 
+    try:
+        return await _validate_client(hass, client, data, result)
+    finally:
+        await client.close()
+
+
+async def _validate_client(
+    hass: HomeAssistant,
+    client: DigitalstromClient,
+    data: dict[str, Any],
+    result: dict[str, Any],
+) -> dict[str, Any]:
     app_token_valid = False
 
     if CONF_TOKEN in data.keys() and data[CONF_TOKEN] is not None:
@@ -102,6 +135,12 @@ class DigitalstromConfigFlow(ConfigFlow, domain=DOMAIN):
         self._existing_entry: ConfigEntry | None = None
         super().__init__(*args, **kwargs)
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return DigitalstromOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -123,6 +162,7 @@ class DigitalstromConfigFlow(ConfigFlow, domain=DOMAIN):
             if ssl == IGNORE_SSL_VERIFICATION:
                 ssl = False
             dsuid = None
+            client = None
             try:
                 client = DigitalstromClient(self._host, self._port, ssl, self.hass.loop)
                 dsuid = await client.get_system_dsuid()
@@ -136,6 +176,9 @@ class DigitalstromConfigFlow(ConfigFlow, domain=DOMAIN):
                 errors["base"] = "invalid_certificate"
             except InvalidFingerprint:
                 errors["base"] = "invalid_fingerprint"
+            finally:
+                if client is not None:
+                    await client.close()
 
             if self._existing_entry is None:
                 self._abort_if_unique_id_configured()
@@ -210,7 +253,10 @@ class DigitalstromConfigFlow(ConfigFlow, domain=DOMAIN):
         client = DigitalstromClient(
             host=self._host, port=self._port, ssl=False, loop=self.hass.loop
         )
-        dsuid = await client.get_system_dsuid()
+        try:
+            dsuid = await client.get_system_dsuid()
+        finally:
+            await client.close()
 
         await self.async_set_unique_id(dsuid)
         self._abort_if_unique_id_configured(updates={CONF_HOST: self._host})
@@ -255,3 +301,67 @@ class DigitalstromConfigFlow(ConfigFlow, domain=DOMAIN):
                 self._ssl = IGNORE_SSL_VERIFICATION
         self._token = self._existing_entry.data.get(CONF_TOKEN, self._token)
         return await self.async_step_user(user_input)
+
+
+class DigitalstromOptionsFlow(OptionsFlow):
+    """Handle the options of a digitalSTROM config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the poll intervals and the request limits."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        fields: dict[Any, Any] = OrderedDict()
+        for option, default in POLL_INTERVAL_OPTIONS.values():
+            fields[vol.Required(option, default=options.get(option, default))] = (
+                vol.All(vol.Coerce(int), vol.Range(min=1))
+            )
+        fields[
+            vol.Required(
+                CONF_STRUCTURE_LOAD_CONCURRENCY,
+                default=options.get(
+                    CONF_STRUCTURE_LOAD_CONCURRENCY, DEFAULT_STRUCTURE_LOAD_CONCURRENCY
+                ),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=32))
+        fields[
+            vol.Required(
+                CONF_MAX_CONCURRENT_REQUESTS,
+                default=options.get(
+                    CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS
+                ),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=16))
+        fields[
+            vol.Required(
+                CONF_MAX_REQUESTS_PER_SECOND,
+                default=options.get(
+                    CONF_MAX_REQUESTS_PER_SECOND, DEFAULT_MAX_REQUESTS_PER_SECOND
+                ),
+            )
+        ] = vol.All(vol.Coerce(float), vol.Range(min=1, max=100))
+        fields[
+            vol.Required(
+                CONF_REQUEST_BURST,
+                default=options.get(CONF_REQUEST_BURST, DEFAULT_REQUEST_BURST),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=1, max=100))
+        fields[
+            vol.Required(
+                CONF_EVENT_OVERFLOW_POLICY,
+                default=options.get(
+                    CONF_EVENT_OVERFLOW_POLICY, DEFAULT_EVENT_OVERFLOW_POLICY
+                ),
+            )
+        ] = vol.In(
+            [
+                EVENT_QUEUE_DROP_SUPERSEDED,
+                EVENT_QUEUE_DROP_OLDEST,
+                EVENT_QUEUE_DROP_NEWEST,
+            ]
+        )
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(fields))
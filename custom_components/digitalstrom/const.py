@@ -16,3 +16,51 @@ WEBSOCKET_WATCHDOG_INTERVAL = timedelta(seconds=10)
 
 APARTMENT_SCENE_UPDATE_INTERVAL = timedelta(seconds=59)
 APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED = timedelta(seconds=29)
+
+CONF_METERING_POWER_INTERVAL: str = "metering_power_interval"
+CONF_METERING_ENERGY_INTERVAL: str = "metering_energy_interval"
+DEFAULT_METERING_POWER_INTERVAL: int = 10
+DEFAULT_METERING_ENERGY_INTERVAL: int = 60
+
+CONF_OUTPUT_POLL_INTERVAL: str = "output_poll_interval"
+CONF_POWER_STATE_POLL_INTERVAL: str = "power_state_poll_interval"
+CONF_MODBUS_POLL_INTERVAL: str = "modbus_poll_interval"
+CONF_FIRMWARE_POLL_INTERVAL: str = "firmware_poll_interval"
+DEFAULT_OUTPUT_POLL_INTERVAL: int = 300
+DEFAULT_POWER_STATE_POLL_INTERVAL: int = 300
+DEFAULT_MODBUS_POLL_INTERVAL: int = 10
+DEFAULT_FIRMWARE_POLL_INTERVAL: int = 900
+
+# Kinds of polled values, each one is read with one bulk request per tick
+POLL_OUTPUTS: str = "outputs"
+POLL_POWER_STATE: str = "power_state"
+POLL_METERING_POWER: str = "metering_power"
+POLL_METERING_ENERGY: str = "metering_energy"
+POLL_MODBUS: str = "modbus"
+POLL_APARTMENT_SCENES: str = "apartment_scenes"
+POLL_FIRMWARE: str = "firmware"
+POLL_MIN_TICK_INTERVAL: float = 1
+POLL_MAX_TICK_INTERVAL: float = 60
+# Outputs and power states are polled every ADAPTIVE_POLL_MIN_INTERVAL
+# seconds after they changed, the interval grows by ADAPTIVE_POLL_BACKOFF
+# with every unchanged poll up to the configured interval
+ADAPTIVE_POLL_MIN_INTERVAL: float = 5
+ADAPTIVE_POLL_BACKOFF: float = 1.5
+
+CONF_STRUCTURE_LOAD_CONCURRENCY: str = "structure_load_concurrency"
+DEFAULT_STRUCTURE_LOAD_CONCURRENCY: int = 8
+STRUCTURE_LOAD_RETRY_MIN_DELAY: int = 10
+STRUCTURE_LOAD_RETRY_MAX_DELAY: int = 300
+STRUCTURE_STORAGE_VERSION: int = 1
+STRUCTURE_SAVE_DELAY: int = 10
+
+CONF_MAX_CONCURRENT_REQUESTS: str = "max_concurrent_requests"
+DEFAULT_MAX_CONCURRENT_REQUESTS: int = 3
+CONF_MAX_REQUESTS_PER_SECOND: str = "max_requests_per_second"
+CONF_REQUEST_BURST: str = "request_burst"
+DEFAULT_MAX_REQUESTS_PER_SECOND: float = 10
+DEFAULT_REQUEST_BURST: int = 20
+CONF_EVENT_OVERFLOW_POLICY: str = "event_overflow_policy"
+DEFAULT_EVENT_OVERFLOW_POLICY: str = "drop_superseded"
+
+SIGNAL_STRUCTURE_UPDATED: str = "digitalstrom_structure_updated_{}"
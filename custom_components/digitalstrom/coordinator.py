@@ -0,0 +1,464 @@
+"""Polling of the digitalSTROM values that are not pushed by events."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .api.apartment import DigitalstromApartment
+from .api.const import REQUEST_PRIORITY_EVENT
+from .api.exceptions import CannotConnect, InvalidAuth, ServerError
+from .api.scene import DigitalstromApartmentScene
+from .const import (
+    ADAPTIVE_POLL_BACKOFF,
+    ADAPTIVE_POLL_MIN_INTERVAL,
+    APARTMENT_SCENE_UPDATE_INTERVAL,
+    APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED,
+    CONF_FIRMWARE_POLL_INTERVAL,
+    CONF_METERING_ENERGY_INTERVAL,
+    CONF_METERING_POWER_INTERVAL,
+    CONF_MODBUS_POLL_INTERVAL,
+    CONF_OUTPUT_POLL_INTERVAL,
+    CONF_POWER_STATE_POLL_INTERVAL,
+    DEFAULT_FIRMWARE_POLL_INTERVAL,
+    DEFAULT_METERING_ENERGY_INTERVAL,
+    DEFAULT_METERING_POWER_INTERVAL,
+    DEFAULT_MODBUS_POLL_INTERVAL,
+    DEFAULT_OUTPUT_POLL_INTERVAL,
+    DEFAULT_POWER_STATE_POLL_INTERVAL,
+    POLL_APARTMENT_SCENES,
+    POLL_FIRMWARE,
+    POLL_MAX_TICK_INTERVAL,
+    POLL_METERING_ENERGY,
+    POLL_METERING_POWER,
+    POLL_MIN_TICK_INTERVAL,
+    POLL_MODBUS,
+    POLL_OUTPUTS,
+    POLL_POWER_STATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Options holding the interval of every kind of polled values, in seconds
+POLL_INTERVAL_OPTIONS: dict[str, tuple[str, int]] = {
+    POLL_OUTPUTS: (CONF_OUTPUT_POLL_INTERVAL, DEFAULT_OUTPUT_POLL_INTERVAL),
+    POLL_POWER_STATE: (
+        CONF_POWER_STATE_POLL_INTERVAL,
+        DEFAULT_POWER_STATE_POLL_INTERVAL,
+    ),
+    POLL_METERING_POWER: (
+        CONF_METERING_POWER_INTERVAL,
+        DEFAULT_METERING_POWER_INTERVAL,
+    ),
+    POLL_METERING_ENERGY: (
+        CONF_METERING_ENERGY_INTERVAL,
+        DEFAULT_METERING_ENERGY_INTERVAL,
+    ),
+    POLL_MODBUS: (CONF_MODBUS_POLL_INTERVAL, DEFAULT_MODBUS_POLL_INTERVAL),
+    POLL_FIRMWARE: (CONF_FIRMWARE_POLL_INTERVAL, DEFAULT_FIRMWARE_POLL_INTERVAL),
+}
+
+# Kinds whose targets are polled with an interval adapted to how often their
+# value changes, the configured interval is the longest one
+ADAPTIVE_POLL_KINDS: tuple[str, ...] = (POLL_OUTPUTS, POLL_POWER_STATE)
+
+
+class DigitalstromPollCoordinator(DataUpdateCoordinator[None]):
+    """Poll the values of the whole apartment with one bulk request per kind.
+
+    Entities register the channels they show for a kind of values. Every tick
+    reads the channels that are due, one request per kind, and the new values
+    reach the entities through the channel callbacks. A bulk query answers
+    for all registered channels at once, they are all updated and rescheduled
+    with it. The next tick is scheduled for the next channel that is due.
+
+    Output channels are read right away after a command and after a scene
+    call on their zone and group, and polled fast after they changed. The
+    interval grows with every poll that finds the same value. The reads after
+    a scene call verify the outputs the devices predicted for it, the values
+    are stored as the values of the scene once two reads agree.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        apartment: DigitalstromApartment,
+    ):
+        super().__init__(
+            hass,
+            _LOGGER,
+            name="Digitalstrom Polling",
+            update_interval=timedelta(seconds=POLL_MAX_TICK_INTERVAL),
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=POLL_MIN_TICK_INTERVAL, immediate=False
+            ),
+        )
+        self.apartment = apartment
+        self.intervals: dict[str, float] = {
+            kind: config_entry.options.get(option, default)
+            for kind, (option, default) in POLL_INTERVAL_OPTIONS.items()
+        }
+        self.intervals[POLL_APARTMENT_SCENES] = (
+            APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED.total_seconds()
+        )
+        # Pollers may return the targets they read if those are more than the
+        # due ones, the ones of ADAPTIVE_POLL_KINDS also take the priority and
+        # max_age of their requests
+        self._pollers: dict[str, Callable[..., Awaitable[list | None]]] = {
+            POLL_OUTPUTS: self._poll_outputs,
+            POLL_POWER_STATE: self._poll_power_states,
+            POLL_METERING_POWER: self._poll_metering_power,
+            POLL_METERING_ENERGY: self._poll_metering_energy,
+            POLL_MODBUS: self._poll_modbus,
+            POLL_APARTMENT_SCENES: self._poll_apartment_scenes,
+            POLL_FIRMWARE: self._poll_firmware,
+        }
+        # Monotonic time every registered target is due next, and how many
+        # entities registered it
+        self._due: dict[str, dict[Any, float]] = {kind: {} for kind in self._pollers}
+        self._registrations: dict[str, dict[Any, int]] = {
+            kind: {} for kind in self._pollers
+        }
+        self._kind_callbacks: dict[str, list[CALLBACK_TYPE]] = {
+            kind: [] for kind in self._pollers
+        }
+        self._target_intervals: dict[str, dict[Any, float]] = {
+            kind: {} for kind in ADAPTIVE_POLL_KINDS
+        }
+        # Targets read on request after a command or a scene call
+        self._requested: dict[str, set[Any]] = {
+            kind: set() for kind in ADAPTIVE_POLL_KINDS
+        }
+        self.failed_kinds: set[str] = set()
+        for event_name in ["callScene", "callSceneBus", "undoScene"]:
+            config_entry.async_on_unload(
+                apartment.register_event_handler(event_name, self._on_scene_event)
+            )
+
+    @callback
+    def async_add_poll_targets(
+        self,
+        kind: str,
+        targets: list,
+        update_callback: CALLBACK_TYPE | None = None,
+    ) -> CALLBACK_TYPE:
+        """Poll the targets until the returned callback is called.
+
+        update_callback is called after every poll of the kind, values that are
+        reported on channels also reach their channel callbacks.
+        """
+        due = self._due[kind]
+        registrations = self._registrations[kind]
+        target_intervals = self._target_intervals.get(kind, {})
+        for target in targets:
+            registrations[target] = registrations.get(target, 0) + 1
+            due.setdefault(target, 0.0)
+            if kind in ADAPTIVE_POLL_KINDS:
+                target_intervals.setdefault(target, ADAPTIVE_POLL_MIN_INTERVAL)
+        if update_callback is not None:
+            self._kind_callbacks[kind].append(update_callback)
+        # Keeps the refresh scheduled while anything is registered
+        remove_listener = self.async_add_listener(lambda: None)
+        self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def remove_poll_targets() -> None:
+            remove_listener()
+            for target in targets:
+                if (count := registrations.get(target, 0)) > 1:
+                    registrations[target] = count - 1
+                else:
+                    registrations.pop(target, None)
+                    due.pop(target, None)
+                    target_intervals.pop(target, None)
+                    self._requested.get(kind, set()).discard(target)
+            if update_callback in self._kind_callbacks[kind]:
+                self._kind_callbacks[kind].remove(update_callback)
+
+        return remove_poll_targets
+
+    async def async_request_poll(
+        self, kind: str, targets: list | None = None, urgent: bool = True
+    ) -> None:
+        """Poll the targets, by default all of the kind, with the next tick.
+
+        Urgent polls of outputs and power states are read at event priority,
+        the others wait behind the reads after events.
+        """
+        due = self._due[kind]
+        target_intervals = self._target_intervals.get(kind, {})
+        for target in list(due.keys()) if targets is None else targets:
+            if target in due:
+                due[target] = 0.0
+            if target in target_intervals:
+                target_intervals[target] = ADAPTIVE_POLL_MIN_INTERVAL
+                if urgent:
+                    self._requested[kind].add(target)
+        await self.async_request_refresh()
+
+    def is_kind_available(self, kind: str) -> bool:
+        return kind not in self.failed_kinds
+
+    def get_poll_interval(self, kind: str, target: Any) -> float:
+        """Return the current poll interval of a target in seconds."""
+        if (
+            interval := self._target_intervals.get(kind, {}).get(target)
+        ) is not None:
+            return interval
+        return self.intervals[kind]
+
+    def _on_scene_event(self, data: dict) -> None:
+        # A scene call sets new target values on the outputs it reaches, the
+        # apartment already shows the predicted ones, read only those right
+        # away to verify them instead of waiting for the next poll. The reads
+        # continue at the shortest interval until the outputs settled, see
+        # DigitalstromDevice.learn_scene_values().
+        devices = self.apartment.get_scene_event_devices(data)
+        scene = int(data["properties"]["sceneID"])
+        predicted = {
+            device
+            for device in devices
+            if device.unverified_scene == scene
+            and device.scene_values is not None
+            and scene in device.scene_values
+        }
+        bulk_queries = {
+            POLL_OUTPUTS: self.apartment.output_query,
+            POLL_POWER_STATE: self.apartment.power_state_query,
+        }
+        for kind in ADAPTIVE_POLL_KINDS:
+            due = self._due[kind]
+            bulk = bulk_queries[kind].should_try()
+            channels = []
+            background = []
+            for device in devices:
+                if kind == POLL_OUTPUTS:
+                    device_channels = [
+                        channel
+                        for channel in device.output_channels.values()
+                        if channel in due
+                    ]
+                else:
+                    device_channels = [
+                        channel for channel in [device.power_state] if channel in due
+                    ]
+                if not bulk and device in predicted:
+                    # Without the bulk query every device is one bus read, the
+                    # predicted outputs are verified after the unknown ones
+                    background.extend(device_channels)
+                else:
+                    channels.extend(device_channels)
+            # Polls of both kinds are merged into one tick
+            if len(channels) > 0:
+                self.hass.async_create_task(self.async_request_poll(kind, channels))
+            if len(background) > 0:
+                self.hass.async_create_task(
+                    self.async_request_poll(kind, background, False)
+                )
+
+    async def _async_update_data(self) -> None:
+        now = time.monotonic()
+        polls = {
+            kind: [target for target, due in self._due[kind].items() if due <= now]
+            for kind in self._pollers
+        }
+        polls = {kind: targets for kind, targets in polls.items() if len(targets) > 0}
+        previous_values = {
+            kind: {target: target.last_value for target in self._due[kind]}
+            for kind in polls
+            if kind in ADAPTIVE_POLL_KINDS
+        }
+        # Scenes called since the outputs of a device were read, by dSUID
+        pending_scenes = {
+            target.device.dsuid: target.device.unverified_scene
+            for target in self._due[POLL_OUTPUTS]
+            if POLL_OUTPUTS in polls and target.device.unverified_scene is not None
+        }
+        # Requested reads must not be answered from the response cache with
+        # the values from before the change, nor wait behind background polls.
+        # Reads verifying a scene must not be answered from the cache either.
+        request_options: dict[str, tuple[int | None, float]] = {}
+        for kind in polls:
+            if self._requested.get(kind):
+                request_options[kind] = (REQUEST_PRIORITY_EVENT, 0)
+                self._requested[kind].clear()
+            elif kind == POLL_OUTPUTS and len(pending_scenes) > 0:
+                request_options[kind] = (None, 0)
+        results = await asyncio.gather(
+            *[
+                self._pollers[kind](targets, *request_options.get(kind, ()))
+                for kind, targets in polls.items()
+            ],
+            return_exceptions=True,
+        )
+        error: BaseException | None = None
+        auth_error: InvalidAuth | None = None
+        now = time.monotonic()
+        for (kind, targets), result in zip(polls.items(), results):
+            if isinstance(result, list):
+                targets = result
+            if kind in ADAPTIVE_POLL_KINDS and not isinstance(result, BaseException):
+                self._adapt_intervals(kind, targets, previous_values[kind])
+            if kind == POLL_OUTPUTS and not isinstance(result, BaseException):
+                # Scene values are output channel values, never power states
+                self.apartment.learn_scene_values(targets, pending_scenes)
+            due = self._due[kind]
+            for target in targets:
+                if target in due:
+                    due[target] = now + self.get_poll_interval(kind, target)
+            # Errors are raised after all kinds were handled, the other kinds
+            # and the next tick must not be skipped
+            if isinstance(result, InvalidAuth):
+                self.failed_kinds.add(kind)
+                auth_error = result
+            elif isinstance(result, (CannotConnect, ServerError)):
+                _LOGGER.debug(f"Polling {kind} failed: {result}")
+                self.failed_kinds.add(kind)
+                error = result
+            elif isinstance(result, BaseException):
+                _LOGGER.error(f"Polling {kind} failed unexpectedly", exc_info=result)
+                self.failed_kinds.add(kind)
+                error = result
+            else:
+                self.failed_kinds.discard(kind)
+            for update_callback in list(self._kind_callbacks[kind]):
+                update_callback()
+        self._schedule_next_tick()
+        if auth_error is not None:
+            raise ConfigEntryAuthFailed from auth_error
+        if error is not None:
+            raise UpdateFailed(error) from error
+
+    def _adapt_intervals(
+        self, kind: str, targets: list, previous_values: dict[Any, Any]
+    ) -> None:
+        target_intervals = self._target_intervals[kind]
+        for target in targets:
+            if (interval := target_intervals.get(target)) is None:
+                continue
+            if target.last_value != previous_values.get(target, target.last_value):
+                target_intervals[target] = ADAPTIVE_POLL_MIN_INTERVAL
+            else:
+                target_intervals[target] = min(
+                    interval * ADAPTIVE_POLL_BACKOFF,
+                    max(self.intervals[kind], ADAPTIVE_POLL_MIN_INTERVAL),
+                )
+
+    def _schedule_next_tick(self) -> None:
+        # The next refresh is scheduled with the interval set here
+        next_due = min(
+            (due for targets in self._due.values() for due in targets.values()),
+            default=None,
+        )
+        delay = POLL_MAX_TICK_INTERVAL
+        if next_due is not None:
+            delay = min(
+                max(next_due - time.monotonic(), POLL_MIN_TICK_INTERVAL),
+                POLL_MAX_TICK_INTERVAL,
+            )
+        self.update_interval = timedelta(seconds=delay)
+
+    async def _poll_outputs(
+        self,
+        channels: list,
+        priority: int | None = None,
+        max_age: float | None = None,
+    ) -> list | None:
+        # The bulk query reads a channel id of the whole apartment, all
+        # registered channels with the due channel ids are read with it.
+        # Channels of unavailable devices are only covered by the bulk query.
+        channel_ids = {channel.channel_id for channel in channels}
+        registered = [
+            channel
+            for channel in self._due[POLL_OUTPUTS]
+            if channel.channel_id in channel_ids
+        ]
+        if await self.apartment.update_output_values(registered, priority, max_age):
+            return registered
+        devices: dict[str, tuple[Any, list[str]]] = {}
+        for channel in channels:
+            if channel.device.get_parent().available:
+                devices.setdefault(channel.device.dsuid, (channel.device, []))[
+                    1
+                ].append(channel.channel_type)
+        # Bus reads on different circuits run concurrently
+        await asyncio.gather(
+            *[
+                device.output_channels_get_values(channel_types, priority, max_age)
+                for device, channel_types in devices.values()
+            ]
+        )
+        return None
+
+    async def _poll_power_states(
+        self,
+        channels: list,
+        priority: int | None = None,
+        max_age: float | None = None,
+    ) -> list | None:
+        # The bulk query reads the power states of all registered devices,
+        # they are reported on the power state channels of the devices
+        registered = list(self._due[POLL_POWER_STATE])
+        if await self.apartment.update_power_states(registered, priority, max_age):
+            return registered
+
+        async def read_power_state(channel: Any) -> None:
+            device = channel.device
+            if not device.get_parent().available:
+                # Check again whether reading is supported once it is back
+                if device.reading_power_state_supported == False:
+                    device.reading_power_state_supported = None
+                return
+            value = await device.get_power_state(priority, max_age)
+            if channel.last_value != value:
+                channel.update(value)
+
+        await asyncio.gather(*[read_power_state(channel) for channel in channels])
+        return None
+
+    async def _poll_metering_power(self, channels: list) -> None:
+        await self.apartment.update_meter_values("power")
+
+    async def _poll_metering_energy(self, channels: list) -> None:
+        await self.apartment.update_meter_values("energy")
+
+    async def _poll_modbus(self, channels: list) -> None:
+        values = await self.apartment.get_modbus_meter_values()
+        for channel in channels:
+            if (value := values.get(channel.meter_id)) != channel.last_value:
+                channel.update(value)
+
+    def _scene_needs_update(self, scene: DigitalstromApartmentScene) -> bool:
+        timestamp = datetime.now()
+        if scene.force_update:
+            return True
+        if (
+            scene.last_update_timestamp == scene.last_change_timestamp
+            and scene.last_update_timestamp
+            < timestamp - APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED
+        ):
+            return True
+        return scene.last_update_timestamp < timestamp - APARTMENT_SCENE_UPDATE_INTERVAL
+
+    async def _poll_apartment_scenes(self, scenes: list) -> None:
+        # State changes are pushed by stateChange events, polling is a fallback
+        if any(
+            self._scene_needs_update(scene)
+            for scene in scenes
+            if scene.state_name is not None
+        ):
+            await self.apartment.update_scene_states()
+
+    async def _poll_firmware(self, circuits: list) -> None:
+        await asyncio.gather(*[circuit.update_available() for circuit in circuits])
@@ -1,5 +1,4 @@
 import logging
-from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.cover import (
@@ -9,17 +8,18 @@ from homeassistant.components.cover import (
     CoverEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.channel import DigitalstromOutputChannel
-from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .const import DOMAIN, POLL_OUTPUTS
+from .coordinator import DigitalstromPollCoordinator
+from .entity import DigitalstromPolledEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=60)
-PARALLEL_UPDATES = 1
+# Requests are limited by the client, bus reads per circuit by its bus scheduler
+PARALLEL_UPDATES = 0
 
 
 async def async_setup_entry(
@@ -29,48 +29,66 @@ async def async_setup_entry(
 ) -> None:
     """Set up the cover platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    covers = []
-    for device in apartment.devices.values():
-        position_outdoor = None
-        angle_outdoor = None
-        position_indoor = None
-        angle_indoor = None
-        for channel in device.output_channels.values():
-            if (
-                channel.channel_type == "shadePositionOutside"
-                and position_outdoor is None
-            ):
-                position_outdoor = channel
-            if (
-                channel.channel_type == "shadeOpeningAngleOutside"
-                and angle_outdoor is None
-            ):
-                angle_outdoor = channel
-            if (
-                channel.channel_type == "shadePositionIndoor"
-                and position_indoor is None
-            ):
-                position_indoor = channel
-            if (
-                channel.channel_type == "shadeOpeningAngleIndoor"
-                and angle_indoor is None
-            ):
-                angle_indoor = channel
-        if position_outdoor is not None:
-            covers.append(DigitalstromCover(position_outdoor, angle_outdoor))
-        if position_indoor is not None:
-            covers.append(DigitalstromCover(position_indoor, angle_indoor))
-    _LOGGER.debug("Adding %i covers", len(covers))
-    async_add_entities(covers)
-
-
-class DigitalstromCover(CoverEntity, DigitalstromEntity):
+    coordinator = hass.data[DOMAIN][config_entry.unique_id]["poll_coordinator"]
+
+    @callback
+    def create_covers() -> list[DigitalstromCover]:
+        covers = []
+        for device in apartment.devices.values():
+            position_outdoor = None
+            angle_outdoor = None
+            position_indoor = None
+            angle_indoor = None
+            for channel in device.output_channels.values():
+                if (
+                    channel.channel_type == "shadePositionOutside"
+                    and position_outdoor is None
+                ):
+                    position_outdoor = channel
+                if (
+                    channel.channel_type == "shadeOpeningAngleOutside"
+                    and angle_outdoor is None
+                ):
+                    angle_outdoor = channel
+                if (
+                    channel.channel_type == "shadePositionIndoor"
+                    and position_indoor is None
+                ):
+                    position_indoor = channel
+                if (
+                    channel.channel_type == "shadeOpeningAngleIndoor"
+                    and angle_indoor is None
+                ):
+                    angle_indoor = channel
+            if position_outdoor is not None:
+                covers.append(
+                    DigitalstromCover(coordinator, position_outdoor, angle_outdoor)
+                )
+            if position_indoor is not None:
+                covers.append(
+                    DigitalstromCover(coordinator, position_indoor, angle_indoor)
+                )
+        _LOGGER.debug("Found %i covers", len(covers))
+        return covers
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_covers
+    )
+
+
+class DigitalstromCover(CoverEntity, DigitalstromPolledEntity):
     def __init__(
         self,
+        coordinator: DigitalstromPollCoordinator,
         position_channel: DigitalstromOutputChannel,
         tilt_channel: DigitalstromOutputChannel | None = None,
     ):
-        super().__init__(position_channel.device, f"O{position_channel.index}")
+        super().__init__(
+            coordinator,
+            position_channel.device,
+            f"O{position_channel.index}",
+            POLL_OUTPUTS,
+        )
         self._attr_supported_features = (
             CoverEntityFeature.OPEN
             | CoverEntityFeature.CLOSE
@@ -82,7 +100,6 @@ class DigitalstromCover(CoverEntity, DigitalstromEntity):
         self.tilt_channel = tilt_channel
         self.device = position_channel.device
         self.client = self.device.client
-        self._attr_should_poll = True
         self.last_tilt = None
         self.entity_id = f"{DOMAIN}.{self.device.dsuid}_{position_channel.index}"
         self._attr_name = self.device.name
@@ -98,56 +115,54 @@ class DigitalstromCover(CoverEntity, DigitalstromEntity):
                 | CoverEntityFeature.SET_TILT_POSITION
             )
 
-    async def async_added_to_hass(self) -> None:
-        await super().async_added_to_hass()
-        self.async_on_remove(
-            self.position_channel.register_update_callback(self.update_callback)
-        )
-
-    def update_callback(self, state: Any, raw_state: Any = None) -> None:
-        if not self.enabled:
-            return
-        self.async_write_ha_state()
+    def get_used_channels(self) -> list[DigitalstromOutputChannel]:
+        if self.tilt_channel is None:
+            return [self.position_channel]
+        return [self.position_channel, self.tilt_channel]
 
     async def async_open_cover(self, **kwargs: Any) -> None:
         """Open cover."""
         await self.position_channel.set_value(100)
+        await self.request_poll()
 
     async def async_close_cover(self, **kwargs: Any) -> None:
         """Close cover."""
         await self.position_channel.set_value(0)
+        await self.request_poll()
 
     async def async_stop_cover(self, **kwargs: Any) -> None:
         """Stop cover."""
         await self.device.call_scene(15)
+        await self.request_poll()
 
     async def async_set_cover_position(self, **kwargs: Any) -> None:
         """Update the current value."""
         await self.position_channel.set_value(kwargs[ATTR_POSITION])
+        await self.request_poll()
 
     async def async_open_cover_tilt(self, **kwargs: Any) -> None:
         """Open the cover tilt."""
         if self.tilt_channel is not None:
             await self.tilt_channel.set_value(100)
+            await self.request_poll()
 
     async def async_close_cover_tilt(self, **kwargs: Any) -> None:
         """Close the cover tilt."""
         if self.tilt_channel is not None:
             await self.tilt_channel.set_value(0)
+            await self.request_poll()
 
     async def async_stop_cover_tilt(self, **kwargs: Any) -> None:
         """Stop the cover tilt."""
         if self.tilt_channel is not None:
             await self.device.call_scene(15)
+            await self.request_poll()
 
     async def async_set_cover_tilt_position(self, **kwargs: Any) -> None:
         """Move the cover tilt to a specific position."""
         if self.tilt_channel is not None:
             await self.tilt_channel.set_value(kwargs[ATTR_TILT_POSITION])
-
-    async def async_update(self, **kwargs: Any) -> None:
-        if self.available:
-            await self.device.output_channels_get_values(self.used_channels)
+            await self.request_poll()
 
     @property
     def current_cover_position(self) -> int | None:
@@ -0,0 +1,43 @@
+"""Diagnostics support for the digitalSTROM integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .api.apartment import DigitalstromApartment
+from .api.client import DigitalstromClient
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the request and event statistics of a config entry."""
+    data = hass.data[DOMAIN][entry.unique_id]
+    client: DigitalstromClient = data["client"]
+    apartment: DigitalstromApartment = data["apartment"]
+    return {
+        "options": dict(entry.options),
+        "structure": {
+            "zones": len(apartment.zones),
+            "circuits": len(apartment.circuits),
+            "devices": len(apartment.devices),
+            "load_timings": apartment.structure_load_timings,
+        },
+        "session": {
+            "logins": client.auth.logins,
+            "failed_logins": client.auth.failed_logins,
+        },
+        "connections": client.get_connection_statistics(),
+        "requests": client.get_request_statistics()
+        | {"retried_requests": client.retried_requests},
+        "scheduler": client.scheduler.get_statistics(),
+        "bus_scheduler": client.bus_scheduler.get_statistics(),
+        "rate_limiter": client.rate_limiter.get_statistics(),
+        "breaker": client.breaker.get_statistics(),
+        "event_listener": client.get_event_listener_statistics(),
+        "events": client.get_event_statistics(),
+    }
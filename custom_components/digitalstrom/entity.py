@@ -1,8 +1,68 @@
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
+from .api.channel import DigitalstromChannel
 from .api.device import DigitalstromDevice
-from .const import DOMAIN
+from .const import DOMAIN, SIGNAL_STRUCTURE_UPDATED
+from .coordinator import DigitalstromPollCoordinator
+
+
+@callback
+def async_setup_structure_entities(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[], list[Entity]],
+) -> None:
+    """Add the entities of the apartment structure now and after every reload.
+
+    Entities whose part of the structure disappeared are removed again, their
+    registry entries are kept with the user's customizations until the device
+    is removed from the config entry. Entities whose structure_signature
+    changed are replaced by the new ones with the same unique ID.
+    """
+    added: dict[str, Entity] = {}
+
+    async def replace_entities(
+        removed: list[Entity], new_entities: list[Entity]
+    ) -> None:
+        # The old entities must be gone before their unique IDs are added again
+        await asyncio.gather(*[e.async_remove() for e in removed])
+        if len(new_entities) > 0:
+            async_add_entities(new_entities)
+
+    @callback
+    def add_new_entities() -> None:
+        entities = {e.unique_id: e for e in create_entities()}
+        removed = []
+        for unique_id, entity in list(added.items()):
+            if (new_entity := entities.get(unique_id)) is None or getattr(
+                new_entity, "structure_signature", None
+            ) != getattr(entity, "structure_signature", None):
+                removed.append(added.pop(unique_id))
+        new_entities = [e for k, e in entities.items() if k not in added]
+        added.update((e.unique_id, e) for e in new_entities)
+        if len(removed) > 0:
+            hass.async_create_task(replace_entities(removed, new_entities))
+        elif len(new_entities) > 0:
+            async_add_entities(new_entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_STRUCTURE_UPDATED.format(config_entry.entry_id),
+            add_new_entities,
+        )
+    )
+    add_new_entities()
 
 
 class DigitalstromEntity(Entity):
@@ -15,6 +75,9 @@ class DigitalstromEntity(Entity):
         self.entity_id = f"{DOMAIN}.{self._attr_unique_id}"
         self._attr_should_poll = False
         self._has_state = False
+        # The device and the attributes the entity was created from, see
+        # async_setup_structure_entities()
+        self.structure_signature = (device, device.get_structure_signature())
 
     async def async_added_to_hass(self) -> None:
         self.async_on_remove(
@@ -58,3 +121,73 @@ class DigitalstromEntity(Entity):
         if not self.enabled:
             return
         self.async_write_ha_state()
+
+
+class DigitalstromPolledEntity(DigitalstromEntity):
+    """Define a digitalSTROM entity whose output channels are polled."""
+
+    # The interval changes after every poll, it is not worth a history
+    _unrecorded_attributes = frozenset({"poll_interval"})
+
+    def __init__(
+        self,
+        coordinator: DigitalstromPollCoordinator,
+        device: DigitalstromDevice,
+        entity_identifier: str,
+        poll_kind: str,
+    ):
+        """Initialize the entity."""
+        super().__init__(device, entity_identifier)
+        self.coordinator = coordinator
+        self.poll_kind = poll_kind
+        self._poll_interval: int | None = None
+
+    def get_used_channels(self) -> list[DigitalstromChannel]:
+        return []
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        channels = self.get_used_channels()
+        for channel in channels:
+            self.async_on_remove(
+                channel.register_update_callback(self.update_callback)
+            )
+        self.async_on_remove(
+            self.coordinator.async_add_poll_targets(
+                self.poll_kind, channels, self.poll_callback
+            )
+        )
+
+    def update_callback(self, state: Any, raw_state: Any = None) -> None:
+        if not self.enabled:
+            return
+        self.async_write_ha_state()
+
+    @callback
+    def poll_callback(self) -> None:
+        # Values are reported by update_callback, only show the new interval
+        if self.enabled and (interval := self.poll_interval) != self._poll_interval:
+            self._poll_interval = interval
+            self.async_write_ha_state()
+
+    async def request_poll(self) -> None:
+        # Read the new values instead of waiting for the next poll
+        await self.coordinator.async_request_poll(
+            self.poll_kind, self.get_used_channels()
+        )
+
+    @property
+    def poll_interval(self) -> int:
+        return round(
+            min(
+                (
+                    self.coordinator.get_poll_interval(self.poll_kind, channel)
+                    for channel in self.get_used_channels()
+                ),
+                default=0,
+            )
+        )
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"poll_interval": self.poll_interval}
@@ -7,7 +7,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.channel import DigitalstromButtonChannel
 from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .entity import DigitalstromEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,12 +52,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up the event platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    events = []
-    for device in apartment.devices.values():
-        if device.button:
-            events.append(DigitalstromButtonEvent(device.button))
-    _LOGGER.debug("Adding %i events", len(events))
-    async_add_entities(events)
+
+    @callback
+    def create_events() -> list[DigitalstromButtonEvent]:
+        events = []
+        for device in apartment.devices.values():
+            if device.button:
+                events.append(DigitalstromButtonEvent(device.button))
+        _LOGGER.debug("Found %i events", len(events))
+        return events
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_events
+    )
 
 
 class DigitalstromButtonEvent(EventEntity, DigitalstromEntity):
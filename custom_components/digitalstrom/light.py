@@ -1,5 +1,4 @@
 import logging
-from datetime import timedelta
 from typing import Any
 
 from homeassistant.components.light import (
@@ -13,17 +12,18 @@ from homeassistant.components.light import (
     LightEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.channel import DigitalstromOutputChannel
-from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .const import DOMAIN, POLL_OUTPUTS
+from .coordinator import DigitalstromPollCoordinator
+from .entity import DigitalstromPolledEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=30)
-PARALLEL_UPDATES = 1
+# Requests are limited by the client, bus reads per circuit by its bus scheduler
+PARALLEL_UPDATES = 0
 
 
 async def async_setup_entry(
@@ -33,40 +33,55 @@ async def async_setup_entry(
 ) -> None:
     """Set up the light platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    lights = []
-    for device in apartment.devices.values():
-        brightness = None
-        color_temp = None
-        hue = None
-        saturation = None
-        color_x = None
-        color_y = None
-        for channel in device.output_channels.values():
-            if channel.channel_type == "brightness" and brightness is None:
-                brightness = channel
-            if channel.channel_type == "colortemp" and color_temp is None:
-                color_temp = channel
-            if channel.channel_type == "hue" and hue is None:
-                hue = channel
-            if channel.channel_type == "saturation" and saturation is None:
-                saturation = channel
-            if channel.channel_type == "x" and color_x is None:
-                color_x = channel
-            if channel.channel_type == "y" and color_y is None:
-                color_y = channel
-        if brightness is not None:
-            lights.append(
-                DigitalstromLight(
-                    brightness, color_temp, hue, saturation, color_x, color_y
+    coordinator = hass.data[DOMAIN][config_entry.unique_id]["poll_coordinator"]
+
+    @callback
+    def create_lights() -> list[DigitalstromLight]:
+        lights = []
+        for device in apartment.devices.values():
+            brightness = None
+            color_temp = None
+            hue = None
+            saturation = None
+            color_x = None
+            color_y = None
+            for channel in device.output_channels.values():
+                if channel.channel_type == "brightness" and brightness is None:
+                    brightness = channel
+                if channel.channel_type == "colortemp" and color_temp is None:
+                    color_temp = channel
+                if channel.channel_type == "hue" and hue is None:
+                    hue = channel
+                if channel.channel_type == "saturation" and saturation is None:
+                    saturation = channel
+                if channel.channel_type == "x" and color_x is None:
+                    color_x = channel
+                if channel.channel_type == "y" and color_y is None:
+                    color_y = channel
+            if brightness is not None:
+                lights.append(
+                    DigitalstromLight(
+                        coordinator,
+                        brightness,
+                        color_temp,
+                        hue,
+                        saturation,
+                        color_x,
+                        color_y,
+                    )
                 )
-            )
-    _LOGGER.debug("Adding %i lights", len(lights))
-    async_add_entities(lights)
+        _LOGGER.debug("Found %i lights", len(lights))
+        return lights
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_lights
+    )
 
 
-class DigitalstromLight(LightEntity, DigitalstromEntity):
+class DigitalstromLight(LightEntity, DigitalstromPolledEntity):
     def __init__(
         self,
+        coordinator: DigitalstromPollCoordinator,
         brightness_channel: DigitalstromOutputChannel,
         color_temp_channel: DigitalstromOutputChannel | None = None,
         hue_channel: DigitalstromOutputChannel | None = None,
@@ -74,7 +89,12 @@ class DigitalstromLight(LightEntity, DigitalstromEntity):
         x_channel: DigitalstromOutputChannel | None = None,
         y_channel: DigitalstromOutputChannel | None = None,
     ):
-        super().__init__(brightness_channel.device, f"O{brightness_channel.index}")
+        super().__init__(
+            coordinator,
+            brightness_channel.device,
+            f"O{brightness_channel.index}",
+            POLL_OUTPUTS,
+        )
 
         self._attr_name = "Light"
         self.brightness_channel = brightness_channel
@@ -86,7 +106,6 @@ class DigitalstromLight(LightEntity, DigitalstromEntity):
         self.device = brightness_channel.device
         self.client = self.device.client
         self.dimmable = self.device.output_dimmable
-        self._attr_should_poll = True
         self.entity_id = f"{DOMAIN}.{self.device.dsuid}_{brightness_channel.index}"
         self._attr_name = self.device.name
         self._attr_min_color_temp_kelvin = DEFAULT_MIN_KELVIN
@@ -159,14 +178,26 @@ class DigitalstromLight(LightEntity, DigitalstromEntity):
                 self.last_color_mode = ColorMode.HS
 
         await self.device.output_channels_set_prepared_values()
+        await self.request_poll()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self.brightness_channel.set_value(0)
+        await self.request_poll()
 
-    async def async_update(self, **kwargs: Any) -> None:
-        if self.available:
-            await self.device.output_channels_get_values(self.used_channels)
+    def get_used_channels(self) -> list[DigitalstromOutputChannel]:
+        return [
+            channel
+            for channel in [
+                self.brightness_channel,
+                self.color_temp_channel,
+                self.hue_channel,
+                self.saturation_channel,
+                self.x_channel,
+                self.y_channel,
+            ]
+            if channel is not None and channel.channel_type in self.used_channels
+        ]
 
     @property
     def is_on(self) -> bool | None:
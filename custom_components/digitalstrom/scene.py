@@ -3,13 +3,13 @@ from typing import Any
 
 from homeassistant.components.scene import Scene as SceneEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.scene import DigitalstromZoneScene
 from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .entity import DigitalstromEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -91,17 +91,24 @@ async def async_setup_entry(
     """Set up the switch platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
 
-    zone_scenes = []
-    for zone in apartment.zones.values():
-        for zone_scene in zone.scenes.values():
-            zone_scenes.append(DigitalstromZoneSceneEntity(zone_scene))
-    _LOGGER.debug("Adding %i zone scenes", len(zone_scenes))
-    async_add_entities(zone_scenes)
+    @callback
+    def create_zone_scenes() -> list[DigitalstromZoneSceneEntity]:
+        zone_scenes = []
+        for zone in apartment.zones.values():
+            for zone_scene in zone.scenes.values():
+                zone_scenes.append(DigitalstromZoneSceneEntity(zone_scene))
+        _LOGGER.debug("Found %i zone scenes", len(zone_scenes))
+        return zone_scenes
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_zone_scenes
+    )
 
 
 class DigitalstromZoneSceneEntity(SceneEntity):
     def __init__(self, zone_scene: DigitalstromZoneScene):
         self.scene = zone_scene
+        self.structure_signature = (zone_scene,)
         self.entity_id = f"{DOMAIN}.{self.scene.zone.apartment.dsuid}_zone{self.scene.zone.zone_id}_group{self.scene.group}_scene{self.scene.number}"
         self._attr_has_entity_name = True
         if self.scene.name is not None:
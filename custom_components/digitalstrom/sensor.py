@@ -28,17 +28,19 @@ from homeassistant.const import (
     UnitOfVolumeFlowRate,
     UnitOfVolumetricFlux,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.channel import DigitalstromMeterSensorChannel, DigitalstromModbusMeterChannel, DigitalstromSensorChannel
-from .const import DOMAIN
-from .entity import DigitalstromEntity
+from .const import DOMAIN, POLL_METERING_ENERGY, POLL_METERING_POWER, POLL_MODBUS
+from .coordinator import DigitalstromPollCoordinator
+from .entity import DigitalstromEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-PARALLEL_UPDATES = 1
+# Values are polled by the poll coordinator, requests are limited by the client
+PARALLEL_UPDATES = 0
 
 SENSORS_MAP: dict[int, SensorEntityDescription] = {
     -1: SensorEntityDescription(
@@ -323,19 +325,35 @@ async def async_setup_entry(
 ) -> None:
     """Set up the sensor platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    circuit_sensors = []
-    for circuit in apartment.circuits.values():
-        for sensor in circuit.sensors.values():
-            circuit_sensors.append(DigitalstromMeterSensor(sensor))
-    _LOGGER.debug("Adding %i circuit sensors", len(circuit_sensors))
-    async_add_entities(circuit_sensors)
-
-    sensors = []
-    for device in apartment.devices.values():
-        for sensor in device.sensors.values():
-            sensors.append(DigitalstromSensor(sensor))
-    _LOGGER.debug("Adding %i sensors", len(sensors))
-    async_add_entities(sensors)
+    coordinator = hass.data[DOMAIN][config_entry.unique_id]["poll_coordinator"]
+
+    @callback
+    def create_circuit_sensors() -> list[DigitalstromMeterSensor]:
+        circuit_sensors = []
+        for circuit in apartment.circuits.values():
+            for sensor in circuit.sensors.values():
+                circuit_sensors.append(
+                    DigitalstromMeterSensor(coordinator, sensor)
+                )
+        _LOGGER.debug("Found %i circuit sensors", len(circuit_sensors))
+        return circuit_sensors
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_circuit_sensors
+    )
+
+    @callback
+    def create_sensors() -> list[DigitalstromSensor]:
+        sensors = []
+        for device in apartment.devices.values():
+            for sensor in device.sensors.values():
+                sensors.append(DigitalstromSensor(sensor))
+        _LOGGER.debug("Found %i sensors", len(sensors))
+        return sensors
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_sensors
+    )
 
     # Add modbus meters
     modbus_sensors = []
@@ -383,16 +401,16 @@ async def async_setup_entry(
                         # Create sensors based on meter type
                         if meter_type == "powerMetering":
                             power_channel = DigitalstromModbusMeterChannel(apartment, meter_id, "power", meter_name, device_info)
-                            modbus_sensors.append(DigitalstromModbusMeterSensor(power_channel))
+                            modbus_sensors.append(DigitalstromModbusMeterSensor(coordinator, power_channel))
                         elif meter_type == "energyMetering":
                             energy_channel = DigitalstromModbusMeterChannel(apartment, meter_id, "energy_consumed", meter_name, device_info)
-                            modbus_sensors.append(DigitalstromModbusMeterSensor(energy_channel))
+                            modbus_sensors.append(DigitalstromModbusMeterSensor(coordinator, energy_channel))
                         elif meter_type == "powerProducedMetering":
                             power_produced_channel = DigitalstromModbusMeterChannel(apartment, meter_id, "power_produced", meter_name, device_info)
-                            modbus_sensors.append(DigitalstromModbusMeterSensor(power_produced_channel))
+                            modbus_sensors.append(DigitalstromModbusMeterSensor(coordinator, power_produced_channel))
                         elif meter_type == "energyProducedMetering":
                             energy_produced_channel = DigitalstromModbusMeterChannel(apartment, meter_id, "energy_produced", meter_name, device_info)
-                            modbus_sensors.append(DigitalstromModbusMeterSensor(energy_produced_channel))
+                            modbus_sensors.append(DigitalstromModbusMeterSensor(coordinator, energy_produced_channel))
                     else:
                         _LOGGER.debug("Skipping non-modbus meter: %s (origin type: %s)", meter_id, origin.get("type"))
             else:
@@ -463,18 +481,21 @@ class DigitalstromSensor(SensorEntity, DigitalstromEntity):
 
 
 class DigitalstromMeterSensor(SensorEntity):
-    def __init__(self, sensor_channel: DigitalstromMeterSensorChannel):
+    def __init__(
+        self,
+        coordinator: DigitalstromPollCoordinator,
+        sensor_channel: DigitalstromMeterSensorChannel,
+    ):
+        self.coordinator = coordinator
         self.channel = sensor_channel
         self.circuit = sensor_channel.circuit
         self._attr_unique_id: str = f"{self.circuit.dsuid}_{self.channel.index}"
         self.entity_id = f"{DOMAIN}.{self._attr_unique_id}"
-        self._attr_should_poll = True
         self._has_state = False
         self._attributes: dict[str, Any] = {}
-        self._state: float | None = None
-        self.entity_id = f"{DOMAIN}.{self.circuit.dsuid}_{self.channel.index}"
-        self._state = None
         self._attr_has_entity_name = True
+        self._attr_should_poll = False
+        self.poll_kind = POLL_METERING_POWER
 
         if self.channel.index == "power":
             self._attr_translation_key = "meter_power"
@@ -483,6 +504,7 @@ class DigitalstromMeterSensor(SensorEntity):
             self._attr_state_class = SensorStateClass.MEASUREMENT
             self._attr_suggested_display_precision = 0
         elif self.channel.index == "energy":
+            self.poll_kind = POLL_METERING_ENERGY
             self._attr_translation_key = "meter_energy"
             self._attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
             self._attr_device_class = SensorDeviceClass.ENERGY
@@ -501,31 +523,41 @@ class DigitalstromMeterSensor(SensorEntity):
             sw_version=self.circuit.sw_version,
         )
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_targets(
+                self.poll_kind, [self.channel], self.async_write_ha_state
+            )
+        )
+
     @property
     def available(self) -> bool:
-        return self.circuit.available
+        return self.circuit.available and self.coordinator.is_kind_available(
+            self.poll_kind
+        )
 
     @property
     def native_value(self) -> float | None:
         """Return the state of the sensor."""
-        return self._state
-
-    async def async_update(self, **kwargs: Any) -> None:
-        value = await self.channel.get_value()
+        value = self.channel.last_value
         if self.channel.index == "energy" and value is not None:
-            self._state = value / 3600000
-        else:
-            self._state = value
+            return value / 3600000
+        return value
 
 
 class DigitalstromModbusMeterSensor(SensorEntity):
-    def __init__(self, channel: DigitalstromModbusMeterChannel):
+    def __init__(
+        self,
+        coordinator: DigitalstromPollCoordinator,
+        channel: DigitalstromModbusMeterChannel,
+    ):
+        self.coordinator = coordinator
         self.channel = channel
         self._attr_unique_id = f"modbus_{channel.meter_id}_{channel.meter_type}"
         self.entity_id = f"{DOMAIN}.{self._attr_unique_id}"
-        self._attr_should_poll = True
-        self._state = None
         self._attr_has_entity_name = True
+        self._attr_should_poll = False
 
         if channel.meter_type == "power":
             self._attr_name = "Power"
@@ -594,13 +626,21 @@ class DigitalstromModbusMeterSensor(SensorEntity):
             via_device=None,
         )
 
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_targets(
+                POLL_MODBUS, [self.channel], self.async_write_ha_state
+            )
+        )
+
     @property
     def available(self) -> bool:
-        return True
+        return self.coordinator.is_kind_available(POLL_MODBUS)
 
     @property
-    def native_value(self) -> float:
-        return self._state
+    def native_value(self) -> float | None:
+        return self.channel.last_value
 
     @property
     def extra_state_attributes(self) -> dict:
@@ -616,6 +656,3 @@ class DigitalstromModbusMeterSensor(SensorEntity):
             "unit": device_info.get("unit", ""),
         }
         return attributes
-
-    async def async_update(self, **kwargs) -> None:
-        self._state = await self.channel.get_value()
@@ -1,26 +1,22 @@
 import logging
-from datetime import datetime, timedelta
 from typing import Any
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .api.channel import DigitalstromOutputChannel
+from .api.channel import DigitalstromChannel, DigitalstromOutputChannel
 from .api.scene import DigitalstromApartmentScene
-from .const import (
-    APARTMENT_SCENE_UPDATE_INTERVAL,
-    APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED,
-    DOMAIN,
-)
-from .entity import DigitalstromEntity
+from .const import DOMAIN, POLL_APARTMENT_SCENES, POLL_POWER_STATE
+from .coordinator import DigitalstromPollCoordinator
+from .entity import DigitalstromPolledEntity, async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
-SCAN_INTERVAL = timedelta(seconds=30)  # TODO: 10 seconds
-PARALLEL_UPDATES = 1
+# Requests are limited by the client, bus reads per circuit by its bus scheduler
+PARALLEL_UPDATES = 0
 
 
 async def async_setup_entry(
@@ -30,68 +26,100 @@ async def async_setup_entry(
 ) -> None:
     """Set up the switch platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-
-    switches = []
-    for device in apartment.devices.values():
-        for channel in device.output_channels.values():
-            if channel.channel_type == "powerLevel":
-                switches.append(DigitalstromSwitch(channel))
-    _LOGGER.debug("Adding %i switches", len(switches))
-    async_add_entities(switches)
+    coordinator = hass.data[DOMAIN][config_entry.unique_id]["poll_coordinator"]
+
+    @callback
+    def create_switches() -> list[DigitalstromSwitch]:
+        switches = []
+        for device in apartment.devices.values():
+            for channel in device.output_channels.values():
+                if channel.channel_type == "powerLevel":
+                    switches.append(DigitalstromSwitch(coordinator, channel))
+        _LOGGER.debug("Found %i switches", len(switches))
+        return switches
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_switches
+    )
 
     apartment_scenes = []
     for apartment_scene in apartment.scenes:
-        apartment_scenes.append(DigitalstromApartmentSceneSwitch(apartment_scene))
+        apartment_scenes.append(
+            DigitalstromApartmentSceneSwitch(coordinator, apartment_scene)
+        )
     _LOGGER.debug("Adding %i apartment scenes", len(apartment_scenes))
     async_add_entities(apartment_scenes)
 
 
-class DigitalstromSwitch(SwitchEntity, DigitalstromEntity):
-    def __init__(self, channel: DigitalstromOutputChannel):
-        super().__init__(channel.device, f"O{channel.index}")
+class DigitalstromSwitch(SwitchEntity, DigitalstromPolledEntity):
+    def __init__(
+        self,
+        coordinator: DigitalstromPollCoordinator,
+        channel: DigitalstromOutputChannel,
+    ):
+        super().__init__(
+            coordinator, channel.device, f"O{channel.index}", POLL_POWER_STATE
+        )
         self.channel = channel
         self.device = channel.device
         self.client = self.device.client
-        self._attr_should_poll = True
-        self.last_power_state: float | None = None
         self._attr_has_entity_name = False
         self.entity_id = f"{DOMAIN}.{self.device.dsuid}_{channel.index}"
         self._attr_name = self.device.name
 
+    def get_used_channels(self) -> list[DigitalstromChannel]:
+        # The power state is polled instead of the output channel value
+        return [self.device.power_state]
+
     @property
     def is_on(self) -> bool | None:
         """Return true if the switch is on."""
-        if self.last_power_state is None:
+        if self.device.power_state.last_value is None:
             return None
-        return self.last_power_state > 0
+        return self.device.power_state.last_value > 0
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self.channel.set_value(100)
+        await self.request_poll()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self.channel.set_value(0)
-
-    async def async_update(self, **kwargs: Any) -> None:
-        if self.available:
-            self.last_power_state = await self.device.get_power_state()
-        elif self.device.reading_power_state_supported == False:
-            self.device.reading_power_state_supported = None
+        await self.request_poll()
 
 
 class DigitalstromApartmentSceneSwitch(SwitchEntity):
-    def __init__(self, apartment_scene: DigitalstromApartmentScene):
+    def __init__(
+        self,
+        coordinator: DigitalstromPollCoordinator,
+        apartment_scene: DigitalstromApartmentScene,
+    ):
+        self.coordinator = coordinator
         self.scene = apartment_scene
         self.entity_id = (
             f"{DOMAIN}.{self.scene.apartment.dsuid}_{self.scene.call_number}"
         )
         self._attr_has_entity_name = True
         self._attr_translation_key = self.scene.name.lower().replace(" ", "_")
-        self._attr_should_poll = True
         self._attr_unique_id: str = (
             f"{self.scene.apartment.dsuid}_scene{self.scene.call_number}"
         )
+        self._attr_should_poll = False
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(self.scene.register_update_callback(self.update_callback))
+        self.async_on_remove(
+            self.coordinator.async_add_poll_targets(
+                POLL_APARTMENT_SCENES, [self.scene]
+            )
+        )
+
+    def update_callback(self, state: bool | None) -> None:
+        if not self.enabled:
+            return
+        self.async_write_ha_state()
 
     @property
     def is_on(self) -> bool | None:
@@ -101,31 +129,12 @@ class DigitalstromApartmentSceneSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         await self.scene.call(self.scene.call_number == 90)
+        await self.coordinator.async_request_poll(POLL_APARTMENT_SCENES, [self.scene])
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         await self.scene.undo(self.scene.call_number == 90)
-
-    async def async_update(self, **kwargs: Any) -> None:
-        if self.scene.state_name is None:
-            return
-        do_update = False
-        timestamp = datetime.now()
-        if self.scene.force_update:
-            do_update = True
-        elif (
-            self.scene.last_update_timestamp == self.scene.last_change_timestamp
-            and self.scene.last_update_timestamp
-            < timestamp - APARTMENT_SCENE_UPDATE_INTERVAL_IF_CHANGED
-        ):
-            do_update = True
-        elif (
-            self.scene.last_update_timestamp
-            < timestamp - APARTMENT_SCENE_UPDATE_INTERVAL
-        ):
-            do_update = True
-        if do_update:
-            await self.scene.get_value()
+        await self.coordinator.async_request_poll(POLL_APARTMENT_SCENES, [self.scene])
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -8,12 +8,14 @@ from homeassistant.components.update import (
     UpdateEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .api.circuit import DigitalstromCircuit
-from .const import DOMAIN
+from .const import DOMAIN, POLL_FIRMWARE
+from .coordinator import DigitalstromPollCoordinator
+from .entity import async_setup_structure_entities
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,19 +27,31 @@ async def async_setup_entry(
 ) -> None:
     """Set up the update platform."""
     apartment = hass.data[DOMAIN][config_entry.unique_id]["apartment"]
-    update_entities = []
-    for circuit in apartment.circuits.values():
-        update_entities.append(DigitalstromUpdateEntity(circuit))
-    _LOGGER.debug("Adding %i update entities", len(update_entities))
-    async_add_entities(update_entities)
+    coordinator = hass.data[DOMAIN][config_entry.unique_id]["poll_coordinator"]
+
+    @callback
+    def create_update_entities() -> list[DigitalstromUpdateEntity]:
+        update_entities = []
+        for circuit in apartment.circuits.values():
+            update_entities.append(DigitalstromUpdateEntity(coordinator, circuit))
+        _LOGGER.debug("Found %i update entities", len(update_entities))
+        return update_entities
+
+    async_setup_structure_entities(
+        hass, config_entry, async_add_entities, create_update_entities
+    )
 
 
 class DigitalstromUpdateEntity(UpdateEntity):
     """Entity representing the update state."""
 
-    def __init__(self, circuit: DigitalstromCircuit) -> None:
+    def __init__(
+        self, coordinator: DigitalstromPollCoordinator, circuit: DigitalstromCircuit
+    ) -> None:
         """Initialize the update entity."""
+        self.coordinator = coordinator
         self.circuit = circuit
+        self.structure_signature = (circuit,)
         self._attr_unique_id: str = f"{self.circuit.dsuid}_firmware"
         self.entity_id = f"{DOMAIN}.{self._attr_unique_id}"
         self._attr_name = "Firmware"
@@ -47,7 +61,7 @@ class DigitalstromUpdateEntity(UpdateEntity):
             UpdateEntityFeature.INSTALL | UpdateEntityFeature.RELEASE_NOTES
         )
         self._attr_in_progress = False
-        self._attr_should_poll = True
+        self._attr_should_poll = False
         self._attr_installed_version = self.circuit.sw_version
 
     @property
@@ -81,17 +95,25 @@ class DigitalstromUpdateEntity(UpdateEntity):
         _LOGGER.debug(f"{self.circuit.name}: Update done")
         await self.circuit.apartment.get_circuits()
         self._attr_in_progress = False
+        await self.coordinator.async_request_poll(POLL_FIRMWARE, [self.circuit])
 
-    async def async_update(self) -> None:
-        """Update entity state.
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_poll_targets(
+                POLL_FIRMWARE, [self.circuit], self.update_callback
+            )
+        )
 
-        Update in_progress, installed_version and latest_version.
-        """
-        status = await self.circuit.update_available()
+    @callback
+    def update_callback(self) -> None:
+        """Update installed_version and latest_version after every poll."""
+        status = self.circuit.firmware_status
         self._attr_installed_version = self.circuit.sw_version
         self._attr_latest_version = (
             "Needs Update" if status == "update" else self.circuit.sw_version
         )
+        self.async_write_ha_state()
 
     async def async_release_notes(self) -> str | None:
         """Return the release notes."""
@@ -26,6 +26,8 @@ class Apartment:
                 return self.get_string(request)
             case "/json/property/getFloating":
                 return self.get_floating(request)
+            case "/json/property/query":
+                return self.property_query(request)
             case "/json/apartment/callScene":
                 return self.call_scene(request)
             case "/json/apartment/undoScene":
@@ -40,6 +42,8 @@ class Apartment:
                 return self.get_temperature_control_status(request)
             case "/json/zone/getReachableScenes":
                 return self.get_reachable_scenes(request)
+            case "/json/metering/getLatest":
+                return self.get_latest_metering(request)
             case "/json/circuit/getConsumption":
                 return self.get_consumption(request)
             case "/json/circuit/getEnergyMeterValue":
@@ -63,6 +67,30 @@ class Apartment:
         path = request.query.get("path")
         return {"ok": True, "result": {"value": 0.0}}
 
+    def property_query(self, request):
+        query = request.query.get("query", "")
+        if "/status/outputs/" in query:
+            # /apartment/zones/*(ZoneID)/devices/*(dSUID)/status/outputs/<channel>(targetValue)
+            channel = query.split("/status/outputs/", 1)[1].split("(", 1)[0]
+            devices = []
+            for dsuid, cv in self.device_output_channels.items():
+                if (value := cv.get(channel)) is not None:
+                    devices.append(
+                        {
+                            "dSUID": dsuid,
+                            "status": [{"outputs": [{channel: [{"targetValue": value}]}]}],
+                        }
+                    )
+            return {"ok": True, "result": {"zones": [{"ZoneID": 0, "devices": devices}]}}
+        if query.startswith("/usr/states/"):
+            # /usr/states/*(name,state)
+            states = []
+            for path, value in self.strings.items():
+                if path.startswith("/usr/states/") and path.endswith("/state"):
+                    states.append({"name": path.split("/")[3], "state": value})
+            return {"ok": True, "result": {"states": states}}
+        return {"ok": True, "result": {}}
+
     def call_scene(self, request):
         scene_number = request.query.get("sceneNumber")
         match int(scene_number):
@@ -142,6 +170,21 @@ class Apartment:
     def get_energy_meter_value(self, request):
         return {"ok": True, "result": {"meterValue": 3600000}}
 
+    def get_latest_metering(self, request):
+        metering_type = request.query.get("type")
+        data = self.read_json_file("getCircuits")
+        circuits = (data or {}).get("result", {}).get("circuits", [])
+        values = []
+        for c in circuits:
+            if not c.get("hasMetering"):
+                continue
+            if metering_type == "energy":
+                value = 3600000
+            else:
+                value = random.uniform(10, 100)
+            values.append({"dSUID": c.get("dSUID"), "value": value})
+        return {"ok": True, "result": {"type": metering_type, "values": values}}
+
     def get_output_channel_value(self, request):
         dsuid = request.query.get("dsuid")
         channels = request.query.get("channels").split(";")
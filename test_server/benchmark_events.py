@@ -0,0 +1,108 @@
+"""Micro-benchmark for DigitalstromApartment.event_callback.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python3 test_server/benchmark_events.py
+
+Check out an older commit and run it again to compare the per-event cost.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.digitalstrom.api.apartment import (  # noqa: E402
+    DigitalstromApartment,
+)
+from custom_components.digitalstrom.api.client import DigitalstromClient  # noqa: E402
+
+DEVICE_COUNT = 200
+ROUNDS = 20000
+
+
+def build_apartment() -> DigitalstromApartment:
+    client = DigitalstromClient("localhost", 8080, False)
+    apartment = DigitalstromApartment(client, "BENCHMARK")
+    apartment.load_devices_from_list(
+        [
+            {
+                "dSUID": f"{i:034x}",
+                "id": f"{i:024x}",
+                "name": f"Device {i}",
+                "zoneID": 1 + i % 10,
+                "groups": [1],
+                "isPresent": True,
+                "sensors": [{"type": 9, "valid": True, "value": 21.0}],
+                "binaryInputs": [
+                    {"targetGroup": 0, "inputType": 1, "inputId": 0, "state": 0}
+                ],
+            }
+            for i in range(DEVICE_COUNT)
+        ]
+    )
+    return apartment
+
+
+def build_events() -> list[dict]:
+    events = []
+    for i in range(DEVICE_COUNT):
+        events.append(
+            {
+                "name": "deviceSensorValue",
+                "source": {"dsid": f"{i:034x}"},
+                "properties": {"sensorIndex": "0", "sensorValueFloat": "21.5"},
+            }
+        )
+        events.append(
+            {
+                "name": "deviceBinaryInputEvent",
+                "source": {"dsid": f"{i:034x}"},
+                "properties": {"inputIndex": "0", "inputState": str(i % 2)},
+            }
+        )
+        # Events the integration doesn't handle
+        events.append(
+            {
+                "name": "zoneSensorValue",
+                "source": {"zoneID": 1 + i % 10},
+                "properties": {"sensorType": "9", "sensorValueFloat": "21.5"},
+            }
+        )
+        events.append(
+            {
+                "name": "apartmentProxyStateChanged",
+                "source": {"dsid": f"{i:034x}"},
+                "properties": {"state": "ok"},
+            }
+        )
+    return events
+
+
+async def run(apartment: DigitalstromApartment, events: list[dict]) -> float:
+    count = 0
+    start = time.perf_counter()
+    while count < ROUNDS:
+        for event in events:
+            await apartment.event_callback(event)
+        count += len(events)
+    return (time.perf_counter() - start) / count
+
+
+def main() -> None:
+    logging.getLogger("digitalstrom_api").setLevel(logging.INFO)
+    apartment = build_apartment()
+    events = build_events()
+    per_event = asyncio.run(run(apartment, events))
+    print(f"{per_event * 1e6:.2f} us per event ({len(events)} distinct events)")
+    logging.basicConfig(level=logging.DEBUG, stream=open(os.devnull, "w"))
+    logging.getLogger("digitalstrom_api").setLevel(logging.DEBUG)
+    per_event = asyncio.run(run(apartment, events))
+    print(f"{per_event * 1e6:.2f} us per event with debug logging enabled")
+
+
+if __name__ == "__main__":
+    main()
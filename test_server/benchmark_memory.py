@@ -0,0 +1,95 @@
+"""Memory benchmark for the apartment model.
+
+Run from the repository root in an environment with Home Assistant installed:
+
+    python3 test_server/benchmark_memory.py [device count]
+
+Builds the model from a synthetic getDevices payload and reports the memory
+held by the devices and their channels.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from custom_components.digitalstrom.api.apartment import (  # noqa: E402
+    DigitalstromApartment,
+)
+from custom_components.digitalstrom.api.client import DigitalstromClient  # noqa: E402
+
+DEVICE_COUNT = 1800
+
+OUTPUT_CHANNELS = [
+    ("brightness", "brightness", "brightness"),
+    ("colortemp", "colortemp", "colortemp"),
+    ("hue", "hue", "hue"),
+    ("saturation", "saturation", "saturation"),
+]
+
+
+def build_devices(count: int) -> list[dict]:
+    devices = []
+    for i in range(count):
+        channels = OUTPUT_CHANNELS[: 1 + i % len(OUTPUT_CHANNELS)]
+        devices.append(
+            {
+                "dSUID": f"{i * 0x1000:034x}",
+                "id": f"{i:024x}",
+                "name": f"Device {i}",
+                "zoneID": 1 + i % 40,
+                "groups": [1 + i % 5],
+                "meterDSUID": f"{i % 12:034x}",
+                "hwInfo": "GE-KM200",
+                "isPresent": True,
+                "buttonUsage": "used",
+                "outputMode": 22,
+                "outputChannels": [
+                    {
+                        "channelIndex": index,
+                        "channelId": channel_id,
+                        "channelName": channel_name,
+                        "channelType": channel_type,
+                    }
+                    for index, (channel_id, channel_name, channel_type) in enumerate(
+                        channels
+                    )
+                ],
+                "sensors": [
+                    {"type": 9, "valid": True, "value": 21.0},
+                    {"type": 13, "valid": True, "value": 45.0},
+                ],
+                "binaryInputs": [
+                    {"targetGroup": 0, "inputType": 1, "inputId": 0, "state": 0}
+                ],
+            }
+        )
+    return devices
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else DEVICE_COUNT
+    data = build_devices(count)
+    client = DigitalstromClient("localhost", 8080, False)
+    apartment = DigitalstromApartment(client, "BENCHMARK")
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    apartment.load_devices_from_list(data)
+    apartment.find_split_devices()
+    gc.collect()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    channels = sum(
+        len(d.sensors) + len(d.binary_inputs) + len(d.output_channels)
+        for d in apartment.devices.values()
+    )
+    print(f"{count} devices, {channels} channels")
+    print(f"{(after - before) / count:.0f} bytes per device")
+    print(f"{(peak - before) / count:.0f} bytes per device at peak")
+
+
+if __name__ == "__main__":
+    main()